@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+
+"""Compares the default scan with the anchored search strategy on long
+documents with few addresses.
+
+    python -m benchmarks.anchored
+"""
+
+import time
+
+from pyap import parser
+
+from benchmarks import corpus
+
+
+def main(count: int = 20, words_between: int = 2000) -> None:
+    for country, addresses in corpus.ADDRESSES.items():
+        text = corpus.document(addresses, count=count, words_between=words_between)
+        for strategy in ("scan", "anchored"):
+            ap = parser.AddressParser(country, strategy=strategy)  # type: ignore
+            ap.registry.warmup([country])
+            started = time.perf_counter()
+            found = ap.parse(text)
+            print(
+                "{country} {strategy:<9} {ms:9.1f} ms  {found} addresses"
+                " in {chars} chars".format(
+                    country=country,
+                    strategy=strategy,
+                    ms=(time.perf_counter() - started) * 1000,
+                    found=len(found),
+                    chars=len(text),
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+
+"""Adversarial inputs for the address rules of every country and a check
+that the time of a scan grows linearly with their length.
+
+Inputs are runs of what the nested optional groups of the rules accept:
+separators (part_div), capitalized words (street names), digit soups
+(street numbers) and a mix of unit words and numbers (line2). Each ends
+with a postal code or a region, so rules needing one are tried in full.
+
+    python -m benchmarks.backtracking [length]
+
+Exits with status 1 if the time grows faster than length ** MAX_EXPONENT
+between `length` and 4 * `length` characters.
+"""
+
+import math
+import random
+import sys
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+from pyap import registry
+
+# (words, what follows a word)
+ADVERSARIAL: Dict[str, Tuple[List[str], List[str]]] = {
+    "separators": (
+        ["Main", "12", "Suite", "St", "N"],
+        [", ", ",\n", " - ", ",, ", "\n", " ,  "],
+    ),
+    "words": (["North", "Park", "Lake", "Saint", "Mount", "Old", "Abc"], [" "]),
+    "digits": (["12", "345", "6-78", "9", "1000", "22B", "#4", "1/2"], [" "]),
+    "line2": (
+        ["Suite", "Floor", "Building", "Bldg", "Box", "Apt", "PO", "Mail", "Stop"]
+        + [str(number) for number in range(1, 1000, 37)],
+        [" "],
+    ),
+}
+
+TAILS = {"US": ", CA 90210", "CA": " BC V2S 2M5", "GB": " SW1A 1AA"}
+RULES = ("full_address", "full_street")
+
+# growth allowed for the time of a scan, and the shortest scans looked
+# at, below it timings are mostly noise
+MAX_EXPONENT = 1.5
+MIN_SECONDS = 0.005
+
+
+def adversarial(kind: str, length: int, country: str, seed: int = 0) -> str:
+    """About `length` characters of adversarial input of a kind"""
+    words, separators = ADVERSARIAL[kind]
+    rnd = random.Random(seed)
+    parts: List[str] = []
+    size = 0
+    while size < length:
+        part = rnd.choice(words) + rnd.choice(separators)
+        parts.append(part)
+        size += len(part)
+    return "".join(parts) + TAILS[country]
+
+
+def scan_time(country: str, rule: str, text: str, repeat: int = 3) -> float:
+    """Best time of a full scan of text with a rule"""
+    pattern = registry.registry.get(country, rule)
+    best = math.inf
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in pattern.finditer(text):
+            pass
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+@dataclass
+class Growth:
+    country: str
+    rule: str
+    kind: str
+    lengths: Tuple[int, int]
+    times: Tuple[float, float]
+
+    @property
+    def exponent(self) -> float:
+        """e in time ~ length ** e"""
+        ratio = max(self.times[1], 1e-9) / max(self.times[0], 1e-9)
+        return math.log(ratio) / math.log(self.lengths[1] / self.lengths[0])
+
+    @property
+    def linear(self) -> bool:
+        return self.times[1] < MIN_SECONDS or self.exponent <= MAX_EXPONENT
+
+
+def measure(
+    country: str, rule: str, kind: str, lengths: Tuple[int, int], seed: int
+) -> Growth:
+    """Scan times of a rule on a short and a long adversarial text"""
+    texts = [adversarial(kind, n, country, seed) for n in lengths]
+    short, long = (scan_time(country, rule, text) for text in texts)
+    return Growth(country, rule, kind, lengths, (short, long))
+
+
+def check(
+    countries: Sequence[str] = registry.COUNTRIES,
+    length: int = 2000,
+    seed: int = 0,
+    retries: int = 1,
+) -> List[Growth]:
+    """Measures the growth of the scan time of every rule and input kind.
+    Superlinear growth is measured again up to `retries` times, so a
+    busy machine doesn't fail the check.
+    """
+    results = []
+    lengths = (length, 4 * length)
+    for country in countries:
+        for rule in RULES:
+            for kind in ADVERSARIAL:
+                growth = measure(country, rule, kind, lengths, seed)
+                for _ in range(retries):
+                    if growth.linear:
+                        break
+                    growth = measure(country, rule, kind, lengths, seed)
+                results.append(growth)
+    return results
+
+
+def main() -> None:
+    length = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    slow = []
+    for growth in check(length=length):
+        print(
+            "{g.country} {g.rule:<13} {g.kind:<11} {t0:9.2f} ms {t1:9.2f} ms"
+            "  length ** {g.exponent:.2f}{flag}".format(
+                g=growth,
+                t0=growth.times[0] * 1000,
+                t1=growth.times[1] * 1000,
+                flag="" if growth.linear else "  SUPERLINEAR",
+            )
+        )
+        if not growth.linear:
+            slow.append(growth)
+    sys.exit(1 if slow else 0)
+
+
+if __name__ == "__main__":
+    main()
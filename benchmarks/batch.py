@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+
+"""Times parsing of many short documents: a loop over pyap.parse,
+pyap.parse_many in the calling process and with a process pool.
+
+    python -m benchmarks.batch [workers]
+"""
+
+import os
+import sys
+import time
+from typing import Callable, List
+
+import pyap
+
+from benchmarks import corpus
+
+
+def texts(count: int = 4000) -> List[str]:
+    """Short documents, every fifth one with an address"""
+    addresses = corpus.US_ADDRESSES
+    return [
+        corpus.prose(200, seed=i)
+        + ("\n" + addresses[i % len(addresses)] if i % 5 == 0 else "")
+        for i in range(count)
+    ]
+
+
+def timed(name: str, run: Callable[[], object]) -> None:
+    started = time.perf_counter()
+    run()
+    print("{name:<24} {s:8.2f} s".format(name=name, s=time.perf_counter() - started))
+
+
+def main() -> None:
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count() or 1
+    docs = texts()
+    pyap.warmup(["US"])
+    timed("loop over pyap.parse", lambda: [pyap.parse(text, "US") for text in docs])
+    timed("parse_many", lambda: pyap.parse_many(docs, "US"))
+    timed(
+        "parse_many, {} workers".format(workers),
+        lambda: pyap.parse_many(docs, "US", workers=workers),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+
+"""Shows how the order of the street type alternation affects scan time.
+
+Before rule generation was made deterministic the order depended on
+PYTHONHASHSEED; this script rebuilds the US `full_address` rule with flat
+alternations of `street_type_list` in different orders and times a scan
+of the same text against the current prefix-factored rule.
+
+    python -m benchmarks.branch_order
+"""
+
+import random
+import re
+import timeit
+from typing import Callable, Dict, List
+
+import pyap.source_US.data as data
+from pyap import utils
+
+from benchmarks import corpus
+
+
+def street_types_regex(ordered: List[str]) -> str:
+    """Same output as data.street_type_list_to_regex, but keeps the order"""
+    regex = "|".join(ordered).lower()
+    return r"\b(?i:" + regex.replace("|", r"\b|\b") + r")\b\.?"
+
+
+def shuffled(seed: int) -> Callable[[List[str]], List[str]]:
+    def order(words: List[str]) -> List[str]:
+        words = list(words)
+        random.Random(seed).shuffle(words)
+        return words
+
+    return order
+
+
+ORDERS: Dict[str, Callable[[List[str]], List[str]]] = {
+    "longest-first": lambda w: sorted(w, key=lambda s: (-len(s), s)),
+    "shortest-first": lambda w: sorted(w, key=lambda s: (len(s), s)),
+    "alphabetical": sorted,
+    "random seed 1": shuffled(1),
+    "random seed 2": shuffled(2),
+    "random seed 3": shuffled(3),
+}
+
+
+def main(repeat: int = 5) -> None:
+    text = corpus.document(corpus.US_ADDRESSES, count=200)
+    current = data.street_type_list_to_regex(data.street_type_list)
+    assert current in data.full_address
+
+    rules = {"trie (current)": data.full_address}
+    for name, order in ORDERS.items():
+        ordered = order(list(set(data.street_type_list)))
+        rules[name] = data.full_address.replace(current, street_types_regex(ordered))
+
+    print("{} chars, {} repeats (best time)".format(len(text), repeat))
+    for name, rule in rules.items():
+        pattern = re.compile(rule, utils.DEFAULT_FLAGS)
+        found = len(pattern.findall(text))
+        timings = timeit.repeat(
+            lambda pattern=pattern: pattern.findall(text), number=1, repeat=repeat
+        )
+        best = min(timings)
+        print("{:<26} {:8.1f} ms  {} matches".format(name, best * 1000, found))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+
+"""Reproducible text corpora for pyap benchmarks.
+
+All generators are seeded, so the same arguments always produce the same
+text and timings can be compared between runs.
+"""
+
+import random
+from typing import List
+
+US_ADDRESSES = [
+    "225 E. John Carpenter Freeway, Suite 1500 Irving, Texas 75062",
+    "2590 Elm Road NE - Warren, OH 44483, US",
+    "899 HEATHROW PARK LN 02-2135\nLAKE MARY,FL 32746",
+    "696 BEAL PKWY NW\nFT WALTON BCH FL 32547",
+    "1300 E MOUNT GARFIELD ROAD, NORTON SHORES 49441",
+    "7601 Penn Avenue South, Richfield MN 55423",
+    "2633 Camino Ramon Ste. 400 San Ramon, CA 94583-2176",
+    "One Baylor Plaza MS: BCM204\nHouston TX 77030-3411",
+    "2744W GRANDIOSE WAY#100\nLEHI UT 84043",
+    "532 N 9TH STREET\nST. LOUIS, MO 63101",
+]
+
+CA_ADDRESSES = [
+    "33771 George Ferguson Way Abbotsford, BC V2S 2M5",
+    "1050 Rue Sherbrooke Ouest, Montréal, QC H3A 2R6",
+    "3000 Steeles Avenue East, Suite 700 Markham, Ontario Canada L3R 4T9",
+    "5800 Ambler Drive, Mississauga, ON L4W 4J4",
+    "400 4th Ave SW Calgary, AB T2P 0J4",
+]
+
+GB_ADDRESSES = [
+    "221B Baker Street, London NW1 6XE",
+    "10 Downing Street, London SW1A 2AA",
+    "Flat 14, Building 2, 37 Market Street, Manchester M1 1PW, United Kingdom",
+    "2 Castle Terrace, Edinburgh EH1 2EW, Scotland",
+    "88 Wood Lane, Birmingham B17 9AY",
+]
+
+ADDRESSES = {"US": US_ADDRESSES, "CA": CA_ADDRESSES, "GB": GB_ADDRESSES}
+
+FILLER = (
+    "Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod "
+    "tempor incididunt ut labore et dolore magna aliqua. Ut enim ad minim "
+    "veniam, quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea "
+    "commodo consequat. Duis aute irure dolor in reprehenderit in voluptate "
+    "velit esse cillum dolore eu fugiat nulla pariatur."
+).split()
+
+
+def prose(words: int, seed: int = 0) -> str:
+    """Address-free text"""
+    rnd = random.Random(seed)
+    return " ".join(rnd.choice(FILLER) for _ in range(words))
+
+
+def document(
+    addresses: List[str], count: int, words_between: int = 60, seed: int = 0
+) -> str:
+    """`count` addresses picked from `addresses`, separated by prose"""
+    rnd = random.Random(seed)
+    parts = []
+    for i in range(count):
+        parts.append(prose(words_between, seed=seed + i))
+        parts.append(rnd.choice(addresses))
+    parts.append(prose(words_between, seed=seed + count))
+    return "\n".join(parts)
+
+
+def snippets(addresses: List[str], count: int, seed: int = 0) -> List[str]:
+    """Short texts like form fields or table cells, most with an address"""
+    rnd = random.Random(seed)
+    return [
+        rnd.choice(addresses) if i % 4 else prose(rnd.randint(2, 8), seed=seed + i)
+        for i in range(count)
+    ]
+
+
+def dump(addresses: List[str], size: int, seed: int = 0) -> str:
+    """About `size` characters of text with an address every few hundred
+    words, like a database export or a crawl
+    """
+    parts = []
+    length = 0
+    i = 0
+    while length < size:
+        part = document(addresses, count=10, words_between=300, seed=seed + i)
+        parts.append(part)
+        length += len(part) + 1
+        i += 11
+    return "\n".join(parts)
+
+
+def test_inputs(country: str) -> List[str]:
+    """Inputs of the parametrized tests of a country, e.g. every string
+    tests/test_parser_us.py feeds to the US rules
+    """
+    import importlib
+
+    module = importlib.import_module("tests.test_parser_" + country.lower())
+    inputs: List[str] = []
+    for test in vars(module).values():
+        for mark in getattr(test, "pytestmark", []):
+            if mark.name != "parametrize":
+                continue
+            inputs.extend(
+                row[0]
+                for row in mark.args[1]
+                if isinstance(row, tuple) and isinstance(row[0], str)
+            )
+    return inputs
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+
+"""Times parsing of texts without addresses with and without the prefilter.
+
+    python -m benchmarks.prefilter
+"""
+
+import timeit
+from typing import Dict
+
+from pyap import parser
+
+from benchmarks import corpus
+
+TEXTS: Dict[str, str] = {
+    "prose": corpus.prose(3000, seed=1),
+    "name field": "Jonathan Q. Public",
+    "invoice line": "Invoice total 1,250.00 paid on 2023-01-04",
+}
+
+
+def main(number: int = 20) -> None:
+    for country in ("US", "CA", "GB"):
+        for name, text in TEXTS.items():
+            times = []
+            for prefilter in (True, False):
+                ap = parser.AddressParser(country, prefilter=prefilter)
+                ap.parse(text)
+                timings = timeit.repeat(
+                    lambda ap=ap, text=text: ap.parse(text), number=number
+                )
+                best = min(timings)
+                times.append(best / number * 1000)
+            print(
+                "{country} {name:<14} {on:9.3f} ms"
+                "  (without prefilter {off:.3f} ms)".format(
+                    country=country, name=name, on=times[0], off=times[1]
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark suite: times importing pyap, building parsers, parse and
+parse_single_street on seeded corpora of every country, and compares the
+results with a saved baseline.
+
+Corpora per country: short snippets (form fields, table cells), the
+inputs of the country test suite, address-dense letters, address-free
+prose and a multi-megabyte dump, also parsed with the anchored strategy.
+A full run takes a few minutes, most of it in the GB dump; --scale 0.1
+gives a quick check.
+
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --baseline results.json [--tolerance 1.2]
+
+Results are written as JSON: {"meta": {...}, "results": {name: seconds}}.
+With a baseline the suite prints the ratio of every timing to the baseline
+and exits with status 1 if one is slower than `tolerance` times.
+"""
+
+import argparse
+import json
+import math
+import platform
+import subprocess
+import sys
+import time
+import timeit
+from typing import Any, Callable, Dict, List, Optional
+
+from pyap import parser
+from pyap import registry
+
+from benchmarks import corpus
+
+Results = Dict[str, float]
+
+
+def corpora(country: str, scale: float = 1.0) -> Dict[str, List[str]]:
+    """Seeded texts of a country by corpus name"""
+    addresses = corpus.ADDRESSES[country]
+    return {
+        "snippets": corpus.snippets(addresses, count=int(2000 * scale)),
+        "test_inputs": corpus.test_inputs(country),
+        "letters": [
+            corpus.document(addresses, count=8, words_between=25, seed=i)
+            for i in range(int(100 * scale))
+        ],
+        "prose": [corpus.prose(300, seed=i) for i in range(int(100 * scale))],
+        "dump": [corpus.dump(addresses, size=int(2_000_000 * scale))],
+    }
+
+
+def best_of(run: Callable[[], object], repeat: int) -> float:
+    best = math.inf
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def subprocess_time(code: str, repeat: int) -> float:
+    """Best wall time of a fresh interpreter running code, less the time
+    of an empty interpreter
+    """
+
+    def run(source: str) -> Callable[[], object]:
+        return lambda: subprocess.run([sys.executable, "-c", source], check=True)
+
+    return best_of(run(code), repeat) - best_of(run("pass"), repeat)
+
+
+def run_suite(countries: List[str], scale: float = 1.0, repeat: int = 5) -> Results:
+    results: Results = {}
+    results["import"] = subprocess_time("import pyap", repeat)
+    for country in countries:
+        # the first parse of a process builds and compiles the rules; the
+        # text has an address so it gets past the prefilter to full_address
+        results[country + "/first_parse"] = subprocess_time(
+            "import pyap; pyap.parse({!r}, {!r})".format(
+                corpus.ADDRESSES[country][0], country
+            ),
+            repeat,
+        )
+        registry.registry.warmup([country])
+        number = 1000
+        results[country + "/construct"] = (
+            min(
+                timeit.repeat(
+                    lambda c=country: parser.AddressParser(c),  # type: ignore
+                    number=number,
+                    repeat=repeat,
+                )
+            )
+            / number
+        )
+
+        ap = parser.AddressParser(country)  # type: ignore
+        anchored = parser.AddressParser(country, strategy="anchored")  # type: ignore
+        for name, texts in corpora(country, scale).items():
+            timed: Dict[str, Callable[[str], object]] = {"parse": ap.parse}
+            if name in ("snippets", "test_inputs"):
+                timed["parse_single_street"] = ap.parse_single_street
+            if name == "dump":
+                timed["parse_anchored"] = anchored.parse
+            # a single run of the dump takes seconds
+            runs = 1 if name == "dump" else repeat
+            for method, parse in timed.items():
+                results["{}/{}/{}".format(country, method, name)] = best_of(
+                    lambda parse=parse, texts=texts: [parse(text) for text in texts],
+                    runs,
+                )
+    return results
+
+
+def compare(results: Results, baseline: Results, tolerance: float) -> List[str]:
+    """Prints the ratios to the baseline, returns the names of the timings
+    slower than `tolerance` times the baseline
+    """
+    slower = []
+    for name, seconds in results.items():
+        before = baseline.get(name)
+        if not before or before <= 0:
+            print("{:<40} {:10.3f} ms  (new)".format(name, seconds * 1000))
+            continue
+        ratio = seconds / before
+        if ratio > tolerance:
+            slower.append(name)
+        print(
+            "{name:<40} {ms:10.3f} ms  {ratio:5.2f}x{flag}".format(
+                name=name,
+                ms=seconds * 1000,
+                ratio=ratio,
+                flag="  SLOWER" if ratio > tolerance else "",
+            )
+        )
+    return slower
+
+
+def meta() -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = argparse.ArgumentParser(description=(__doc__ or "").split("\n\n")[0])
+    args.add_argument("--countries", nargs="+", default=list(registry.COUNTRIES))
+    args.add_argument("--scale", type=float, default=1.0, help="corpus size factor")
+    args.add_argument("--repeat", type=int, default=5)
+    args.add_argument("--output", help="file to write the results to")
+    args.add_argument("--baseline", help="results file to compare with")
+    args.add_argument("--tolerance", type=float, default=1.2)
+    options = args.parse_args(argv)
+
+    results = run_suite(options.countries, options.scale, options.repeat)
+    if options.output:
+        with open(options.output, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta(), "results": results}, f, indent=2)
+
+    baseline: Results = {}
+    if options.baseline:
+        with open(options.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+    slower = compare(results, baseline, options.tolerance)
+    sys.exit(1 if slower else 0)
+
+
+if __name__ == "__main__":
+    main()
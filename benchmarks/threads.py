@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+
+"""Times parse_many with a pool of 1 to N threads sharing one parser.
+Threads run in parallel only on free-threaded (no GIL) builds, e.g.
+python3.13t; with the GIL the throughput stays flat.
+
+    python -m benchmarks.threads [max_threads]
+"""
+
+import os
+import sys
+import time
+
+import pyap
+
+from benchmarks import batch
+
+
+def main() -> None:
+    max_threads = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count() or 1
+    docs = batch.texts()
+    pyap.warmup(["US"])
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print("GIL {}".format("enabled" if gil else "disabled"))
+
+    baseline = 0.0
+    for threads in range(1, max_threads + 1):
+        started = time.perf_counter()
+        pyap.parse_many(docs, "US", workers=threads, backend="thread")
+        rate = len(docs) / (time.perf_counter() - started)
+        baseline = baseline or rate
+        print(
+            "{threads:>3} thread(s) {rate:10.0f} texts/s {speedup:6.2f}x".format(
+                threads=threads, rate=rate, speedup=rate / baseline
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
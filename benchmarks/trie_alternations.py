@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+"""Compares prefix-factored (trie) word alternations with flat ones.
+
+Every word list of the country rule modules is rebuilt as a flat
+'longest first' alternation and both grammars scan the inputs of the
+country test suites and a synthetic document.
+
+    python -m benchmarks.trie_alternations
+"""
+
+import re
+import timeit
+from types import ModuleType
+from typing import Dict, List
+
+import pyap.source_CA.data as data_ca
+import pyap.source_GB.data as data_gb
+import pyap.source_US.data as data_us
+from pyap import utils
+
+from benchmarks import corpus
+
+
+def word_lists(data: ModuleType) -> List[List[str]]:
+    lists = [data.zero_to_nine_list, data.ten_to_ninety_list]
+    if data is not data_ca:
+        # the CA street types are a flat alternation in list order already
+        lists.append(data.street_type_list)
+    if data is data_us:
+        lists += [
+            data.street_type_leading_list,
+            data.STATE_NAMES + data.TERRITORY_NAMES,
+            list(data.STATE_ABBRS + data.NON_STATE_ABBRS),
+            data.single_street_name_list,
+        ]
+    return lists
+
+
+def flat_rule(data: ModuleType) -> str:
+    rule = data.full_address
+    for words in word_lists(data):
+        trie = utils.str_list_to_trie_regex(words)
+        assert trie in rule
+        rule = rule.replace(trie, utils.str_list_to_trie_regex(words, factor=False))
+    return rule
+
+
+def main(repeat: int = 5) -> None:
+    modules: Dict[str, ModuleType] = {"US": data_us, "CA": data_ca, "GB": data_gb}
+    for country, data in modules.items():
+        texts = corpus.test_inputs(country)
+        if country == "US":
+            texts.append(corpus.document(corpus.US_ADDRESSES, count=100))
+        size = sum(map(len, texts))
+        print("{}: {} texts, {} chars".format(country, len(texts), size))
+
+        for name, rule in (("flat", flat_rule(data)), ("trie", data.full_address)):
+            pattern = re.compile(rule, utils.DEFAULT_FLAGS)
+
+            def scan(
+                pattern: "re.Pattern[str]" = pattern, texts: List[str] = texts
+            ) -> int:
+                return sum(len(pattern.findall(text)) for text in texts)
+
+            found = scan()
+            best = min(timeit.repeat(scan, number=1, repeat=repeat))
+            print(
+                "  {:<5} {:8.1f} ms {:8.2f} MB/s  {} matches, {} chars of rule".format(
+                    name, best * 1000, size / best / 1e6, found, len(rule)
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -3,8 +3,50 @@
 """
 API hooks
 """
-from .api import parse, parse_single_street
+import importlib
+from typing import TYPE_CHECKING, Any
+
+from .api import parse, parse_columns, parse_single_street, warmup
 from .utils import match, findall
 from .address import Address
 
-__all__ = ["parse", "parse_single_street", "match", "findall", "Address"]
+if TYPE_CHECKING:
+    from .aio import aparse, aparse_many
+    from .batch import parse_many, iter_parse_many
+    from .files import parse_file, iter_parse_file
+
+# modules importing asyncio, process pools or mmap are loaded on first use,
+# so they don't slow down `import pyap`
+_LAZY_MODULES = {
+    "aparse": "aio",
+    "aparse_many": "aio",
+    "parse_many": "batch",
+    "iter_parse_many": "batch",
+    "parse_file": "files",
+    "iter_parse_file": "files",
+}
+
+__all__ = [
+    "parse",
+    "parse_single_street",
+    "parse_columns",
+    "aparse",
+    "aparse_many",
+    "parse_many",
+    "iter_parse_many",
+    "parse_file",
+    "iter_parse_file",
+    "warmup",
+    "match",
+    "findall",
+    "Address",
+]
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_MODULES.get(name)
+    if module is None:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    value = getattr(importlib.import_module("." + module, __name__), name)
+    globals()[name] = value
+    return value
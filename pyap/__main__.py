@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+
+"""python -m pyap runs the command line tool"""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
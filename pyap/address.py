@@ -11,12 +11,55 @@
     :license: MIT, see LICENSE for more details.
 """
 
-from dataclasses import dataclass, asdict
-from typing import Union
+import json
+import operator
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, TextIO, Tuple, Union
 
+# separators stripped from both ends of parsed values
+STRIP_CHARS = " ,;:\n"
 
-@dataclass
+
+def _clean(value: Any) -> Any:
+    """Strips separators around a parsed value"""
+    if isinstance(value, str):
+        return value.strip(STRIP_CHARS)
+    if isinstance(value, list) and value and isinstance(value[0], str):
+        return value[0].strip(STRIP_CHARS)
+    return value
+
+
+# slots instead of a __dict__ per instance, addresses are often kept by
+# the million; fields have no class-level defaults so they don't clash
+# with the slots, the defaults are in __init__
+@dataclass(init=False)
 class Address:
+    __slots__ = (
+        "match_end",
+        "match_start",
+        "country_id",
+        "full_street",
+        "full_address",
+        "line1",
+        "line2",
+        "city",
+        "floor",
+        "region1",
+        "country",
+        "route_id",
+        "occupancy",
+        "mail_stop",
+        "street_type",
+        "building_id",
+        "postal_code",
+        "typeless_street_name",
+        "street_name",
+        "street_number",
+        "po_box",
+        "post_direction",
+        "phone_number",
+    )
+
     match_end: int
     match_start: int
 
@@ -24,31 +67,106 @@ class Address:
     full_street: str
     full_address: str
     line1: str
-    line2: Union[str, None] = None
-    city: Union[str, None] = None
-    floor: Union[str, None] = None
-    region1: Union[str, None] = None
-    country: Union[str, None] = None
-    route_id: Union[str, None] = None
-    occupancy: Union[str, None] = None
-    mail_stop: Union[str, None] = None
-    street_type: Union[str, None] = None
-    building_id: Union[str, None] = None
-    postal_code: Union[str, None] = None
-    typeless_street_name: Union[str, None] = None
-    street_name: Union[str, None] = None
-    street_number: Union[str, None] = None
-    po_box: Union[str, None] = None
-    post_direction: Union[str, None] = None
-    phone_number: Union[str, None] = None
-
-    def __post_init__(self):
-        for s_field in self.__dataclass_fields__:
-            field = getattr(self, s_field)
-            if isinstance(field, str):
-                setattr(self, s_field, field.strip(" ,;:\n"))
-            elif isinstance(field, list) and field and isinstance(field[0], str):
-                setattr(self, s_field, field[0].strip(" ,;:\n"))
+    line2: Union[str, None]
+    city: Union[str, None]
+    floor: Union[str, None]
+    region1: Union[str, None]
+    country: Union[str, None]
+    route_id: Union[str, None]
+    occupancy: Union[str, None]
+    mail_stop: Union[str, None]
+    street_type: Union[str, None]
+    building_id: Union[str, None]
+    postal_code: Union[str, None]
+    typeless_street_name: Union[str, None]
+    street_name: Union[str, None]
+    street_number: Union[str, None]
+    po_box: Union[str, None]
+    post_direction: Union[str, None]
+    phone_number: Union[str, None]
+
+    def __init__(
+        self,
+        match_end: int,
+        match_start: int,
+        country_id: str,
+        full_street: str,
+        full_address: str,
+        line1: str,
+        line2: Union[str, None] = None,
+        city: Union[str, None] = None,
+        floor: Union[str, None] = None,
+        region1: Union[str, None] = None,
+        country: Union[str, None] = None,
+        route_id: Union[str, None] = None,
+        occupancy: Union[str, None] = None,
+        mail_stop: Union[str, None] = None,
+        street_type: Union[str, None] = None,
+        building_id: Union[str, None] = None,
+        postal_code: Union[str, None] = None,
+        typeless_street_name: Union[str, None] = None,
+        street_name: Union[str, None] = None,
+        street_number: Union[str, None] = None,
+        po_box: Union[str, None] = None,
+        post_direction: Union[str, None] = None,
+        phone_number: Union[str, None] = None,
+    ):
+        self.match_end = match_end
+        self.match_start = match_start
+        self.country_id = _clean(country_id)
+        self.full_street = _clean(full_street)
+        self.full_address = _clean(full_address)
+        self.line1 = _clean(line1)
+        self.line2 = _clean(line2)
+        self.city = _clean(city)
+        self.floor = _clean(floor)
+        self.region1 = _clean(region1)
+        self.country = _clean(country)
+        self.route_id = _clean(route_id)
+        self.occupancy = _clean(occupancy)
+        self.mail_stop = _clean(mail_stop)
+        self.street_type = _clean(street_type)
+        self.building_id = _clean(building_id)
+        self.postal_code = _clean(postal_code)
+        self.typeless_street_name = _clean(typeless_street_name)
+        self.street_name = _clean(street_name)
+        self.street_number = _clean(street_number)
+        self.po_box = _clean(po_box)
+        self.post_direction = _clean(post_direction)
+        self.phone_number = _clean(phone_number)
+
+    @classmethod
+    def from_row(cls, row: "Row") -> "Address":
+        """Address of a row made by the parser, whose values are clean
+        already, without the cleanup of __init__
+        """
+        addr = object.__new__(cls)
+        (
+            addr.match_end,
+            addr.match_start,
+            addr.country_id,
+            addr.full_street,
+            addr.full_address,
+            addr.line1,
+            addr.line2,
+            addr.city,
+            addr.floor,
+            addr.region1,
+            addr.country,
+            addr.route_id,
+            addr.occupancy,
+            addr.mail_stop,
+            addr.street_type,
+            addr.building_id,
+            addr.postal_code,
+            addr.typeless_street_name,
+            addr.street_name,
+            addr.street_number,
+            addr.po_box,
+            addr.post_direction,
+            addr.phone_number,
+        ) = row
+        return addr
 
     def __repr__(self) -> str:
         # Address object is represented as textual address
@@ -59,5 +177,31 @@ class Address:
             pass
         return address
 
-    def as_dict(self) -> dict:
-        return asdict(self)
+    def as_dict(self) -> Dict[str, Any]:
+        # values are strings, numbers or None, no need for the deep copy
+        # of dataclasses.asdict
+        return dict(zip(FIELDS, _values(self)))
+
+    def as_tuple(self) -> Tuple[Any, ...]:
+        """Field values in FIELDS order"""
+        return _values(self)
+
+    def to_json(self) -> str:
+        """Compact single-line JSON object of the fields"""
+        return _JSON.encode(dict(zip(FIELDS, _values(self))))
+
+    @staticmethod
+    def to_jsonl(addresses: Iterable["Address"], fp: TextIO) -> None:
+        """Writes addresses to a text file as JSON lines"""
+        fp.writelines(
+            _JSON.encode(dict(zip(FIELDS, _values(a)))) + "\n" for a in addresses
+        )
+
+
+# names of the Address fields, in the order of their values in rows
+FIELDS: Tuple[str, ...] = Address.__slots__
+# an address as a plain tuple of field values, in FIELDS order
+Row = Tuple[Any, ...]
+
+_values = operator.attrgetter(*FIELDS)
+_JSON = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+"""
+    pyap.aio
+    ~~~~~~~~~~~~~~~~
+
+    This module contains asyncio versions of the parse functions. Parsing
+    runs in an executor, so long scans don't block the event loop.
+
+    :copyright: (c) 2015 by Vladimir Goncharov.
+    :license: MIT, see LICENSE for more details.
+"""
+
+import asyncio
+import concurrent.futures as cf
+from typing import Iterable, List, Literal, Optional, Union
+
+from . import address
+from . import api
+from . import parser
+
+
+async def aparse(
+    text: str,
+    country: Literal["US", "GB", "CA"],
+    *,
+    executor: Optional[cf.Executor] = None,
+    timeout: Optional[float] = None,
+) -> List[address.Address]:
+    """Parses text in `executor` (the loop's default thread pool if None)
+    and returns a list of Address objects.
+
+    Raises asyncio.TimeoutError if the text isn't parsed in `timeout`
+    seconds. A timeout or a cancellation drops a parse still waiting in
+    the executor; one already running finishes in the background.
+    """
+    # fail early and in the caller's task on unknown countries
+    parser.AddressParser(country)
+    loop = asyncio.get_running_loop()
+    # a module-level function, so process pools can pickle the call
+    future = loop.run_in_executor(executor, api.parse, text, country)
+    return await asyncio.wait_for(future, timeout)
+
+
+async def aparse_many(
+    texts: Iterable[str],
+    country: Literal["US", "GB", "CA"],
+    *,
+    executor: Optional[cf.Executor] = None,
+    concurrency: Optional[int] = None,
+    timeout: Optional[float] = None,
+    return_exceptions: bool = False,
+) -> List[Union[List[address.Address], BaseException]]:
+    """Parses many texts, at most `concurrency` at a time, and returns a
+    list of addresses per text in input order.
+
+    `timeout` is the deadline of each text, counted from the start of its
+    parse. Errors (asyncio.TimeoutError included) are raised and cancel
+    the other texts, or with `return_exceptions` take the place of the
+    results of the failed texts, like in asyncio.gather.
+    """
+    if concurrency is not None and concurrency < 1:
+        raise ValueError("concurrency must be a positive number")
+    parser.AddressParser(country)
+    semaphore = asyncio.Semaphore(concurrency) if concurrency else None
+
+    async def parse_one(text: str) -> List[address.Address]:
+        if semaphore is None:
+            return await aparse(text, country, executor=executor, timeout=timeout)
+        async with semaphore:
+            return await aparse(text, country, executor=executor, timeout=timeout)
+
+    tasks = [asyncio.ensure_future(parse_one(text)) for text in texts]
+    try:
+        return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+    except BaseException:
+        # gather leaves the other tasks running on errors and cancellation
+        for task in tasks:
+            task.cancel()
+        raise
@@ -10,18 +10,35 @@
     :license: MIT, see LICENSE for more details.
 """
 
-from typing import Literal, List
+from typing import Any, Dict, Iterable, Literal, List, Optional
 
 from . import parser
 from . import address
+from . import registry
 
 
-def parse(some_text: str, country: Literal["US", "GB", "CA"]) -> List[address.Address]:
+def parse(
+    some_text: str,
+    country: Literal["US", "GB", "CA"],
+    *,
+    timeout: Optional[float] = None,
+    max_steps: Optional[int] = None,
+) -> parser.ParseResult:
     """Creates request to AddressParser
     and returns list of Address objects
     """
     ap = parser.AddressParser(country)
-    return ap.parse(some_text)
+    return ap.parse(some_text, timeout=timeout, max_steps=max_steps)
+
+
+def parse_columns(
+    texts: Iterable[str], country: Literal["US", "GB", "CA"]
+) -> Dict[str, List[Any]]:
+    """Parses many texts into one list of values per Address field plus
+    'text_index', without creating Address objects
+    """
+    ap = parser.AddressParser(country)
+    return ap.parse_columns(texts)
 
 
 def parse_single_street(
@@ -29,3 +46,13 @@ def parse_single_street(
 ) -> List[address.Address]:
     ap = parser.AddressParser(country)
     return ap.parse_single_street(some_text)
+
+
+def warmup(countries: Optional[Iterable[str]] = None) -> None:
+    """Builds and compiles detection rules ahead of time,
+    e.g. in a pre-fork hook, so the first parse call doesn't pay for it.
+    Warms up all supported countries by default.
+    """
+    if countries is None:
+        countries = registry.COUNTRIES
+    registry.registry.warmup(countries)
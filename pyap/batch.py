@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+
+"""
+    pyap.batch
+    ~~~~~~~~~~~~~~~~
+
+    This module contains functions parsing many texts at once. Texts are
+    parsed by a single parser in the calling process or spread over a
+    pool of worker processes or threads.
+
+    :copyright: (c) 2015 by Vladimir Goncharov.
+    :license: MIT, see LICENSE for more details.
+"""
+
+import concurrent.futures as cf
+import functools
+import itertools
+import math
+from typing import Any, Callable, Collection, Dict, Iterable, Iterator, List, Literal
+from typing import Optional, Sequence, Set, Tuple, Union
+
+from . import address
+from . import parser
+from . import registry
+
+# characters sent to a worker process at once when the input is a stream
+CHUNK_CHARS = 1 << 18
+# chunks per worker when the input size is known, lets fast workers
+# take over the work of slow ones
+CHUNKS_PER_WORKER = 4
+# per-text cost of a parse call, in characters
+TEXT_COST = 64
+
+Result = Tuple[int, List[address.Address]]
+# addresses cross the process boundary as plain tuples of field values
+Row = address.Row
+
+
+def _init_worker(countries: Tuple[str, ...], cache_dir: Optional[str]) -> None:
+    registry.registry.cache_dir = cache_dir
+    registry.registry.warmup(countries)
+
+
+def _parse_chunk(
+    countries: Tuple[str, ...], start: int, texts: List[str]
+) -> List[Tuple[int, List[Row]]]:
+    parsers = [parser.AddressParser(country) for country in countries]  # type: ignore
+    return [
+        (start + i, [row for ap in parsers for row in ap.parse_tuples(text)])
+        for i, text in enumerate(texts)
+    ]
+
+
+def _from_rows(results: List[Tuple[int, List[Row]]]) -> List[Result]:
+    return [
+        (index, [address.Address.from_row(row) for row in rows])
+        for index, rows in results
+    ]
+
+
+def _parse_texts(
+    parsers: List[parser.AddressParser], start: int, texts: List[str]
+) -> List[Result]:
+    return [
+        (start + i, [a for ap in parsers for a in ap.parse(text)])
+        for i, text in enumerate(texts)
+    ]
+
+
+def _cost(text: str) -> int:
+    return len(text) + TEXT_COST
+
+
+def _chunks(
+    texts: Iterable[str], workers: int, chunk_size: Optional[int] = None
+) -> Iterator[Tuple[int, List[str]]]:
+    """Splits texts into runs of consecutive texts of about the same size,
+    `chunk_size` characters if given
+    """
+    if chunk_size is not None:
+        budget = chunk_size
+    elif isinstance(texts, Collection):
+        total = sum(map(_cost, texts))
+        budget = math.ceil(total / (workers * CHUNKS_PER_WORKER))
+    else:
+        budget = CHUNK_CHARS
+    start = 0
+    chunk: List[str] = []
+    size = 0
+    for text in texts:
+        chunk.append(text)
+        size += _cost(text)
+        if size >= budget:
+            yield start, chunk
+            start += len(chunk)
+            chunk = []
+            size = 0
+    if chunk:
+        yield start, chunk
+
+
+def iter_parse_many(
+    texts: Iterable[str],
+    country: Union[str, Sequence[str]],
+    *,
+    workers: Optional[int] = None,
+    backend: Literal["process", "thread"] = "process",
+    chunk_size: Optional[int] = None,
+) -> Iterator[Result]:
+    """Yields (index, addresses) pairs as soon as each text is parsed.
+
+    `country` may be a list of countries, the addresses of a text are
+    then those of every country in that order.
+
+    With `workers` > 1 texts are parsed by a pool of that many processes,
+    each compiling the rules once at start, or with backend="thread" by
+    that many threads sharing one parser, and pairs come in completion
+    order, otherwise in input order. Workers get texts in chunks of about
+    `chunk_size` characters.
+
+    Threads skip the pickling of texts and results but run in parallel
+    only on free-threaded (no GIL) Python builds.
+    """
+    if backend not in ("process", "thread"):
+        raise ValueError("Unknown batch backend: {!r}".format(backend))
+    countries = [country] if isinstance(country, str) else list(country)
+    parsers = [parser.AddressParser(c) for c in countries]  # type: ignore
+    if workers is None or workers == 1:
+        for index, text in enumerate(texts):
+            yield index, [a for ap in parsers for a in ap.parse(text)]
+        return
+    if workers < 1:
+        raise ValueError("workers must be a positive number")
+
+    executor: cf.Executor
+    task: Callable[[int, List[str]], Any]
+    load: Callable[[Any], List[Result]]
+    if backend == "thread":
+        executor = cf.ThreadPoolExecutor(max_workers=workers)
+        task = functools.partial(_parse_texts, parsers)
+        load = list
+    else:
+        names = tuple(ap.country for ap in parsers)
+        executor = cf.ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(names, registry.registry.cache_dir),
+        )
+        task = functools.partial(_parse_chunk, names)
+        load = _from_rows
+
+    chunks = _chunks(texts, workers, chunk_size)
+    with executor:
+        pending: Set["cf.Future[Any]"] = set()
+        while True:
+            # keep a bounded number of chunks in flight, texts may be a stream
+            for start, chunk in itertools.islice(chunks, 2 * workers - len(pending)):
+                pending.add(executor.submit(task, start, chunk))
+            if not pending:
+                return
+            done, pending = cf.wait(pending, return_when=cf.FIRST_COMPLETED)
+            for future in done:
+                yield from load(future.result())
+
+
+def parse_many(
+    texts: Iterable[str],
+    country: Union[str, Sequence[str]],
+    *,
+    workers: Optional[int] = None,
+    backend: Literal["process", "thread"] = "process",
+    chunk_size: Optional[int] = None,
+) -> List[List[address.Address]]:
+    """Parses many texts, returns a list of addresses per text in input order"""
+    results: Dict[int, List[address.Address]] = dict(
+        iter_parse_many(
+            texts, country, workers=workers, backend=backend, chunk_size=chunk_size
+        )
+    )
+    return [results[index] for index in range(len(results))]
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+
+"""
+    pyap.cache
+    ~~~~~~~~~~~~~~~~
+
+    This module contains an optional on-disk cache of generated address
+    detection rules. Cached rules are reloaded without importing (and so
+    without running the generator code of) the country rule modules.
+
+    :copyright: (c) 2015 by Vladimir Goncharov.
+    :license: MIT, see LICENSE for more details.
+"""
+
+import hashlib
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+from typing import Optional
+
+from . import exceptions as e
+
+# cache files of an older layout are ignored
+CACHE_VERSION = 1
+
+
+def rules_origin(country: str) -> str:
+    """Returns the path of the rule module of a country without importing it"""
+    try:
+        spec = importlib.util.find_spec("pyap.source_" + country + ".data")
+    except ImportError:
+        spec = None
+    if spec is None or spec.origin is None:
+        raise e.CountryDetectionMissing(
+            'Detection rules for country "{country}" not found.'.format(
+                country=country
+            ),
+            "Error 2",
+        )
+    return spec.origin
+
+
+def rules_fingerprint(country: str, flags: int) -> str:
+    """Fingerprint of everything a generated rule depends on:
+    the rule module, the shared helpers and the Python version
+    """
+    digest = hashlib.sha256()
+    digest.update(
+        "{version}:{python}:{flags}".format(
+            version=CACHE_VERSION, python=sys.version, flags=flags
+        ).encode()
+    )
+    helpers = os.path.join(os.path.dirname(__file__), "utils.py")
+    for path in (rules_origin(country), helpers):
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+class DiskCache:
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _path(self, country: str, name: str) -> str:
+        return os.path.join(
+            self.directory, "{country}-{name}.json".format(country=country, name=name)
+        )
+
+    def load(self, country: str, name: str, fingerprint: str) -> Optional[str]:
+        """Returns the cached rule source or None if it is missing or stale"""
+        try:
+            with open(self._path(country, name), encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or entry.get("fingerprint") != fingerprint:
+            return None
+        source = entry.get("source")
+        return source if isinstance(source, str) else None
+
+    def store(self, country: str, name: str, fingerprint: str, source: str) -> None:
+        """Writes the rule source; a failing cache never breaks parsing"""
+        entry = {"fingerprint": fingerprint, "python": sys.version, "source": source}
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(entry, f)
+                # atomic, concurrent workers never see partial files
+                os.replace(tmp_path, self._path(country, name))
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError:
+            pass
@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+
+"""
+    pyap.cli
+    ~~~~~~~~~~~~~~~~
+
+    This module contains the `pyap` command line tool, which parses the
+    addresses in plain text, JSON lines or CSV files (or stdin) in bulk
+    and writes them as JSON lines or CSV.
+
+    :copyright: (c) 2015 by Vladimir Goncharov.
+    :license: MIT, see LICENSE for more details.
+"""
+
+import argparse
+import contextlib
+import csv
+import json
+import operator
+import os
+import sys
+import time
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
+
+from . import address
+from . import batch
+from . import registry
+
+FORMATS = ("text", "jsonl", "csv")
+EXTENSIONS = {".txt": "text", ".jsonl": "jsonl", ".ndjson": "jsonl", ".csv": "csv"}
+# columns written before the Address fields
+ID_COLUMNS = ("source", "record")
+
+# (source, record id, text)
+Record = Tuple[str, Any, str]
+
+
+class InputError(Exception):
+    pass
+
+
+def _open(path: str) -> "contextlib.AbstractContextManager[TextIO]":
+    if path == "-":
+        return contextlib.nullcontext(sys.stdin)
+    return open(path, encoding="utf-8", newline="")
+
+
+def _format(path: str, fmt: Optional[str]) -> str:
+    if fmt is not None:
+        return fmt
+    return EXTENSIONS.get(os.path.splitext(path)[1].lower(), "text")
+
+
+def _field(record: Dict[str, Any], name: str) -> Any:
+    """Value of a JSON field given as a dotted path, e.g. 'body.text'"""
+    value: Any = record
+    for key in name.split("."):
+        if not isinstance(value, dict) or key not in value:
+            raise KeyError(name)
+        value = value[key]
+    return value
+
+
+def _json_lines(fp: TextIO, path: str) -> Iterator[Dict[str, Any]]:
+    for number, line in enumerate(fp, 1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as err:
+            raise InputError(
+                "line {number} of {path} is not valid JSON: {err}".format(
+                    number=number, path=path, err=err
+                )
+            )
+
+
+def read_records(
+    paths: List[str],
+    fmt: Optional[str] = None,
+    text_field: str = "text",
+    id_field: Optional[str] = None,
+) -> Iterator[Record]:
+    """Yields the texts of the input files with their source and id:
+    a whole text file is one record, a JSON line or a CSV row is one
+    record identified by `id_field` or its number in the file
+    """
+    csv.field_size_limit(min(sys.maxsize, 2**31 - 1))
+    for path in paths:
+        path_format = _format(path, fmt)
+        with _open(path) as fp:
+            if path_format == "text":
+                yield path, 1, fp.read()
+                continue
+            if path_format == "jsonl":
+                rows: Iterator[Dict[str, Any]] = _json_lines(fp, path)
+                get = _field
+            else:
+                rows = iter(csv.DictReader(fp))
+                # CSV columns are named as they are, dots included
+                get = operator.getitem
+            for number, row in enumerate(rows, 1):
+                try:
+                    text = get(row, text_field)
+                    record = get(row, id_field) if id_field else number
+                except KeyError as err:
+                    raise InputError(
+                        "record {number} of {path} has no field {field}".format(
+                            number=number, path=path, field=err
+                        )
+                    )
+                yield path, record, "" if text is None else str(text)
+
+
+class _Writer:
+    def __init__(self, fp: TextIO, fmt: str):
+        self.fp = fp
+        self.fmt = fmt
+        if fmt == "csv":
+            self.csv = csv.writer(fp)
+            self.csv.writerow(ID_COLUMNS + address.FIELDS)
+
+    def write(self, source: str, record: Any, addr: address.Address) -> None:
+        if self.fmt == "csv":
+            self.csv.writerow((source, record) + addr.as_tuple())
+        else:
+            # the address object with the ids in front:
+            # {"source":..,"record":..,"match_end":..}
+            ids = json.dumps(
+                {"source": source, "record": record},
+                ensure_ascii=False,
+                separators=(",", ":"),
+            )
+            self.fp.write(ids[:-1] + "," + addr.to_json()[1:] + "\n")
+
+
+class _Progress:
+    """Counts records and addresses and reports the throughput on stderr"""
+
+    def __init__(self, enabled: bool, interval: float = 1.0):
+        self.enabled = enabled
+        self.interval = interval
+        self.started = time.perf_counter()
+        self.reported = self.started
+        self.records = 0
+        self.addresses = 0
+        self.chars = 0
+
+    def update(self, addresses: int) -> None:
+        self.records += 1
+        self.addresses += addresses
+        now = time.perf_counter()
+        if self.enabled and now - self.reported >= self.interval:
+            self.reported = now
+            sys.stderr.write("\r" + self.line(now))
+            sys.stderr.flush()
+
+    def line(self, now: float) -> str:
+        elapsed = max(now - self.started, 1e-9)
+        return (
+            "{records} records, {addresses} addresses,"
+            " {rate:.0f} records/s, {speed:.2f} MB/s".format(
+                records=self.records,
+                addresses=self.addresses,
+                rate=self.records / elapsed,
+                speed=self.chars / elapsed / 1e6,
+            )
+        )
+
+    def done(self) -> None:
+        if self.enabled:
+            sys.stderr.write("\r" + self.line(time.perf_counter()) + "\n")
+
+
+def _countries(value: str) -> List[str]:
+    """Comma-separated list of countries, e.g. 'US,CA'"""
+    countries = [c.strip().upper() for c in value.split(",") if c.strip()]
+    unknown = [c for c in countries if c not in registry.COUNTRIES]
+    if unknown or not countries:
+        raise argparse.ArgumentTypeError(
+            "unsupported country {!r}, choose from {}".format(
+                ",".join(unknown) or value, ",".join(registry.COUNTRIES)
+            )
+        )
+    return countries
+
+
+def _arguments() -> argparse.ArgumentParser:
+    args = argparse.ArgumentParser(
+        prog="pyap",
+        description="Finds addresses in text, JSON lines or CSV files (or stdin).",
+    )
+    args.add_argument(
+        "files", nargs="*", default=["-"], help="input files, '-' is stdin"
+    )
+    args.add_argument(
+        "-c",
+        "--country",
+        type=_countries,
+        default="US",
+        help="comma-separated countries whose addresses are looked for, "
+        "e.g. US,CA (default: US)",
+    )
+    args.add_argument(
+        "-f",
+        "--format",
+        choices=FORMATS,
+        help="input format (default: by file extension, text for stdin)",
+    )
+    args.add_argument(
+        "--text-field",
+        default="text",
+        help="field of JSON lines / column of CSV rows with the text, "
+        "nested JSON fields as 'a.b' (default: text)",
+    )
+    args.add_argument(
+        "--id-field", help="field identifying a record (default: record number)"
+    )
+    args.add_argument("-o", "--output", help="output file (default: stdout)")
+    args.add_argument(
+        "-t", "--output-format", choices=("jsonl", "csv"), default="jsonl"
+    )
+    args.add_argument("-w", "--workers", type=int, help="number of worker processes")
+    args.add_argument(
+        "--chunk-size",
+        type=int,
+        default=batch.CHUNK_CHARS,
+        help="characters sent to a worker at once (default: %(default)s)",
+    )
+    args.add_argument(
+        "--progress", action="store_true", help="report throughput on stderr"
+    )
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _arguments()
+    options = args.parse_args(argv)
+    if options.workers is not None and options.workers < 1:
+        args.error("--workers must be a positive number")
+    if options.chunk_size < 1:
+        args.error("--chunk-size must be a positive number")
+
+    records = read_records(
+        options.files, options.format, options.text_field, options.id_field
+    )
+    progress = _Progress(options.progress)
+    # ids of the records handed to the parsers, results may come out of order
+    ids: Dict[int, Tuple[str, Any]] = {}
+
+    def texts() -> Iterator[str]:
+        for index, (source, record, text) in enumerate(records):
+            ids[index] = (source, record)
+            progress.chars += len(text)
+            yield text
+
+    output: "contextlib.AbstractContextManager[TextIO]"
+    if options.output:
+        output = open(options.output, "w", encoding="utf-8", newline="")
+    else:
+        output = contextlib.nullcontext(sys.stdout)
+    try:
+        with output as fp:
+            writer = _Writer(fp, options.output_format)
+            for index, addresses in batch.iter_parse_many(
+                texts(),
+                options.country,
+                workers=options.workers,
+                chunk_size=options.chunk_size,
+            ):
+                source, record = ids.pop(index)
+                for addr in addresses:
+                    writer.write(source, record, addr)
+                progress.update(len(addresses))
+    except (InputError, OSError) as err:
+        args.exit(1, "pyap: error: {}\n".format(err))
+    progress.done()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+
+"""
+    pyap.files
+    ~~~~~~~~~~~~~~~~
+
+    This module contains parsing of files too big to be held in memory
+    as text. Files are memory-mapped and decoded piece by piece.
+
+    :copyright: (c) 2015 by Vladimir Goncharov.
+    :license: MIT, see LICENSE for more details.
+"""
+
+import bisect
+import codecs
+import mmap
+import os
+from typing import Iterator, List, Literal, NamedTuple, Union
+
+from . import address
+from . import parser
+
+# bytes decoded at once
+READ_SIZE = 1 << 20
+
+
+class FileAddress(NamedTuple):
+    """Address found in a file; address.match_start and address.match_end
+    are character offsets in the decoded file
+    """
+
+    address: address.Address
+    byte_start: int
+    byte_end: int
+
+
+class _DecodedSpans:
+    """Decodes a buffer piece by piece and remembers the byte offsets of
+    the recent pieces, to turn character offsets into byte offsets
+    """
+
+    def __init__(self, data: Union[bytes, mmap.mmap], encoding: str):
+        self.data = data
+        self.encoding = encoding
+        # `empty` is the BOM of encodings writing one
+        self.empty = len("".encode(encoding))
+        self.char_starts: List[int] = []
+        self.byte_starts: List[int] = []
+        self.texts: List[str] = []
+
+    def _encoded_len(self, text: str) -> int:
+        return len(text.encode(self.encoding)) - self.empty
+
+    def __iter__(self) -> Iterator[str]:
+        decoder = codecs.getincrementaldecoder(self.encoding)()
+        size = len(self.data)
+        char_start = 0
+        for offset in range(0, size, READ_SIZE):
+            data = self.data[offset : offset + READ_SIZE]
+            text = decoder.decode(data, final=offset + READ_SIZE >= size)
+            if not text:
+                continue
+            # bytes of an incomplete character stay in the decoder
+            byte_end = offset + len(data) - len(decoder.getstate()[0])
+            self.char_starts.append(char_start)
+            self.byte_starts.append(byte_end - self._encoded_len(text))
+            self.texts.append(text)
+            char_start += len(text)
+            yield text
+
+    def forget(self, char_offset: int) -> None:
+        """Drops the pieces that end before `char_offset`"""
+        keep = max(bisect.bisect_right(self.char_starts, char_offset) - 1, 0)
+        del self.char_starts[:keep]
+        del self.byte_starts[:keep]
+        del self.texts[:keep]
+
+    def byte_offset(self, char_offset: int) -> int:
+        i = max(bisect.bisect_right(self.char_starts, char_offset) - 1, 0)
+        text = self.texts[i][: char_offset - self.char_starts[i]]
+        return self.byte_starts[i] + self._encoded_len(text)
+
+
+def iter_parse_file(
+    path: Union[str, "os.PathLike[str]"],
+    country: Literal["US", "GB", "CA"],
+    encoding: str = "utf-8",
+    overlap: int = parser.STREAM_OVERLAP,
+) -> Iterator[FileAddress]:
+    """Yields addresses of a text file as soon as they are found,
+    without reading the whole file into memory
+    """
+    ap = parser.AddressParser(country)
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            spans = _DecodedSpans(data, encoding)
+            for addr in ap.iter_parse_chunks(spans, overlap, on_trim=spans.forget):
+                yield FileAddress(
+                    addr,
+                    spans.byte_offset(addr.match_start),
+                    spans.byte_offset(addr.match_end),
+                )
+
+
+def parse_file(
+    path: Union[str, "os.PathLike[str]"],
+    country: Literal["US", "GB", "CA"],
+    encoding: str = "utf-8",
+    overlap: int = parser.STREAM_OVERLAP,
+) -> List[FileAddress]:
+    """Parses a text file, e.g. a multi-gigabyte statement dump,
+    holding only a window of it in memory as text
+    """
+    return list(iter_parse_file(path, country, encoding, overlap))
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+"""
+    pyap.offsets
+    ~~~~~~~~~~~~~~~~
+
+    This module contains the mapping of offsets in normalized text back
+    to offsets in the text as it was given to the parser.
+
+    :copyright: (c) 2015 by Vladimir Goncharov.
+    :license: MIT, see LICENSE for more details.
+"""
+
+import bisect
+from typing import List, Tuple
+
+
+class ShiftTable:
+    """Run-length encoded offset map: from normalized offset starts[i]
+    on, the original offset is the normalized one plus shifts[i].
+
+    Normalization only shortens runs of spaces and commas, so the table
+    holds a couple of entries per shortened run instead of one offset
+    per character.
+    """
+
+    def __init__(self) -> None:
+        self.starts: List[int] = [0]
+        self.shifts: List[int] = [0]
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def add(self, clean: int, original: int) -> None:
+        """Maps normalized offset `clean` (and the following ones,
+        until the next entry) to `original`
+        """
+        shift = original - clean
+        if self.starts[-1] == clean:
+            self.shifts[-1] = shift
+            if len(self.shifts) > 1 and self.shifts[-2] == shift:
+                self.starts.pop()
+                self.shifts.pop()
+        elif self.shifts[-1] != shift:
+            self.starts.append(clean)
+            self.shifts.append(shift)
+
+    def original(self, clean: int) -> int:
+        return clean + self.shifts[bisect.bisect_right(self.starts, clean) - 1]
+
+    def span(self, start: int, end: int) -> Tuple[int, int]:
+        """Original span of the normalized text[start:end]"""
+        if end <= start:
+            return self.original(start), self.original(start)
+        return self.original(start), self.original(end - 1) + 1
+
+    def forget(self, clean: int) -> None:
+        """Drops the entries no offset from `clean` on depends on"""
+        keep = bisect.bisect_right(self.starts, clean) - 1
+        del self.starts[:keep]
+        del self.shifts[:keep]
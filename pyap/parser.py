@@ -11,96 +11,470 @@
     :license: MIT, see LICENSE for more details.
 """
 
+import functools
+import itertools
 import re
-import importlib
-from typing import Any, Dict, List, Literal
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Literal, Optional
+from typing import TextIO, Tuple, TypeVar, Union, cast
 
-from . import exceptions as e
 from . import address
-from . import utils
+from . import offsets
+from . import registry as r
+
+# characters before and after an anchor (postal code, region)
+# that may belong to the same address
+ANCHOR_WINDOW_BEFORE = 512
+ANCHOR_WINDOW_AFTER = 128
+
+# all types of hyphens/dashes are converted to a simple old-school dash
+# from http://utf8-chartable.de/unicode-utf8-table.pl?
+# start=8192&number=128&utf8=string-literal
+_DASHES = dict.fromkeys("‐‑‒–—―", "-")
+# the passes of _normalize_string, in order: dashes, spaces and tabs
+# around commas and excessive empty spaces; the replacements are plain
+# strings, so re.sub doesn't call back into Python
+_NORMALIZE_PASSES = (
+    (re.compile("[{dashes}]".format(dashes="".join(_DASHES))), "-"),
+    (re.compile(r"[\ \t]*,[\ \t,]*"), ", "),
+    (re.compile(r"\ {2,}"), " "),
+)
+# what the passes shorten or move, found in a single pass to map offsets;
+# dashes are replaced in place
+_SHIFTING = re.compile("|".join(regex.pattern for regex, _ in _NORMALIZE_PASSES[1:]))
+
+
+# suffixes of group names of alternative definitions of an address part,
+# the value of 'postal_code_b' is stored as 'postal_code'
+_ALTERNATIVE_SUFFIXES = "_a_b_c_d_e_f_g_h_i_j_k_l_m"
+
+# for every field of address.FIELDS after country_id: (index of the group
+# named like the field or None, indices of the groups of its alternatives
+# in order of precedence)
+FieldGroups = Tuple[Tuple[Optional[int], Tuple[int, ...]], ...]
+# match_end, match_start and country_id don't come from the grammar
+_GRAMMAR_FIELDS = address.FIELDS[3:]
+
+
+# by id() of the compiled grammar, hashing a Pattern hashes all its code;
+# entries hold the grammar, so its id isn't reused while it is cached
+_FIELD_GROUPS: Dict[int, Tuple[re.Pattern[str], FieldGroups]] = {}
+
+
+def _field_groups(rules: re.Pattern[str]) -> FieldGroups:
+    """Where the fields of an address are in the groups of a grammar,
+    computed once per compiled grammar. A field is the last non-empty of
+    its alternatives (groups like 'postal_code_b'), otherwise the group
+    named like the field.
+    """
+    cached = _FIELD_GROUPS.get(id(rules))
+    if cached is not None and cached[0] is rules:
+        return cached[1]
+
+    plain: Dict[str, int] = {}
+    alternatives: Dict[str, List[int]] = {}
+    for name, number in sorted(rules.groupindex.items(), key=lambda item: item[1]):
+        # indices into match.groups(), which has no group 0
+        if name[-2:] in _ALTERNATIVE_SUFFIXES:
+            alternatives.setdefault(name[:-2], []).insert(0, number - 1)
+        else:
+            plain[name] = number - 1
+    # if only parsing a single street the full address is the full street
+    if "full_address" not in plain and "full_address" not in alternatives:
+        if "full_street" in plain:
+            plain["full_address"] = plain["full_street"]
+        if "full_street" in alternatives:
+            alternatives["full_address"] = alternatives["full_street"]
+    fields = tuple(
+        (plain.get(field), tuple(alternatives.get(field, ())))
+        for field in _GRAMMAR_FIELDS
+    )
+    if len(_FIELD_GROUPS) >= 64:
+        _FIELD_GROUPS.clear()
+    _FIELD_GROUPS[id(rules)] = (rules, fields)
+    return fields
+
+
+# iter_parse: characters read at once, and the longest address that is
+# still found when it crosses a chunk boundary
+STREAM_CHUNK_SIZE = 1 << 16
+STREAM_OVERLAP = 2048
+# text kept before the search position for lookbehinds
+STREAM_CONTEXT = 32
+
+# parse(timeout=..., max_steps=...): characters where a match may start,
+# searched in one step, and the longest address found across steps
+SCAN_WINDOW = 1 << 12
+SCAN_OVERLAP = STREAM_OVERLAP
+
+
+_T = TypeVar("_T")
+
+
+class ParseResult(List[_T]):
+    """List of addresses found in a text. `truncated` is set when the
+    time or step budget of the parse ran out before the end of the text,
+    the list then holds the addresses found up to that point.
+    """
+
+    truncated: bool = False
+
+
+class _Budget:
+    def __init__(self, timeout: Optional[float], max_steps: Optional[int]):
+        self.deadline = None if timeout is None else time.perf_counter() + timeout
+        self.steps = max_steps
+        self.exhausted = False
+
+    @classmethod
+    def of(
+        cls, timeout: Optional[float], max_steps: Optional[int]
+    ) -> Optional["_Budget"]:
+        """A budget, or None if parsing is not limited"""
+        if timeout is None and max_steps is None:
+            return None
+        return cls(timeout, max_steps)
+
+    def spend(self) -> bool:
+        """Takes a step, returns False once the budget is used up"""
+        if self.steps is not None:
+            self.steps -= 1
+            self.exhausted = self.steps < 0
+        if self.deadline is not None and not self.exhausted:
+            self.exhausted = time.perf_counter() >= self.deadline
+        return not self.exhausted
+
+    def time_only(self) -> "_Budget":
+        """A budget with the same deadline and no step limit"""
+        budget = _Budget(None, None)
+        budget.deadline = self.deadline
+        return budget
 
 
 class AddressParser:
-    def __init__(self, country: Literal["US", "CA", "GB"]):
-        """Initialize with custom arguments"""
+    """Finds addresses of one country in text.
+
+    A parser keeps no state between calls, so one instance can be shared
+    by any number of threads.
+    """
+
+    def __init__(
+        self,
+        country: Literal["US", "CA", "GB"],
+        registry: Optional[r.PatternRegistry] = None,
+        prefilter: bool = True,
+        strategy: Literal["scan", "anchored"] = "scan",
+    ):
+        """Initialize with custom arguments.
+
+        strategy="anchored" finds postal codes / regions first and looks
+        for full addresses only in the text around them, which keeps
+        parsing of long documents proportional to the number of addresses.
+        """
+        if strategy not in ("scan", "anchored"):
+            raise ValueError("Unknown search strategy: {!r}".format(strategy))
         self.country = country.upper()
+        self.registry = registry or r.registry
+        # skip the full scan of texts without a postal code / region
+        self.prefilter = prefilter
+        self.strategy = strategy
+        # fail early on unknown countries, rules are compiled on first use
+        self.registry.check_country(self.country)
 
-        try:
-            # import detection rules
-            package = "pyap" + ".source_" + self.country + ".data"
-            data = importlib.import_module(package)
-            self.rules = data.full_address
-            self.single_street_rules = data.full_street
-
-        except ImportError:
-            raise e.CountryDetectionMissing(
-                'Detection rules for country "{country}" not found.'.format(
-                    country=self.country
-                ),
-                "Error 2",
-            )
+    @property
+    def rules(self) -> re.Pattern[str]:
+        return self.registry.get(self.country, "full_address")
+
+    @property
+    def single_street_rules(self) -> re.Pattern[str]:
+        return self.registry.get(self.country, "full_street")
 
-    def parse(self, text: str) -> List[address.Address]:
+    def parse(
+        self,
+        text: str,
+        timeout: Optional[float] = None,
+        max_steps: Optional[int] = None,
+    ) -> "ParseResult[address.Address]":
         """Returns a list of addresses found in text
-        together with parsed address parts
+        together with parsed address parts.
+
+        With `timeout` (seconds) or `max_steps` the text is searched
+        SCAN_WINDOW characters per step, and the search stops when the
+        budget runs out: the result holds the addresses found so far and
+        its `truncated` flag is set. A single step is not interrupted, nor
+        is the normalization of the text, a single linear pass before the
+        search.
         """
-        return self._parse(self.rules, text)
+        return self._parse(
+            "full_address",
+            text,
+            self._parse_address,
+            prefilter=self.prefilter,
+            anchored=self.strategy == "anchored",
+            budget=_Budget.of(timeout, max_steps),
+        )
 
-    def parse_single_street(self, text: str) -> List[address.Address]:
-        return self._parse(self.single_street_rules, text)
+    def parse_tuples(
+        self,
+        text: str,
+        timeout: Optional[float] = None,
+        max_steps: Optional[int] = None,
+    ) -> "ParseResult[address.Row]":
+        """Like parse(), but returns addresses as plain tuples of field
+        values in address.FIELDS order, without creating Address objects
+        """
+        return self._parse(
+            "full_address",
+            text,
+            self._parse_row,
+            prefilter=self.prefilter,
+            anchored=self.strategy == "anchored",
+            budget=_Budget.of(timeout, max_steps),
+        )
 
-    def _parse(self, rules: str, text: str) -> List[address.Address]:
-        results = []
-        self.clean_text = self._normalize_string(text)
+    def parse_columns(self, texts: Iterable[str]) -> Dict[str, List[Any]]:
+        """Parses many texts into one list of values per Address field,
+        with an entry per address found; the 'text_index' list holds the
+        index of the text each address was found in
+        """
+        text_index: List[int] = []
+        rows: List[address.Row] = []
+        for index, text in enumerate(texts):
+            found = self.parse_tuples(text)
+            text_index.extend(itertools.repeat(index, len(found)))
+            rows.extend(found)
+        columns: Dict[str, List[Any]] = {"text_index": text_index}
+        values = zip(*rows) if rows else [()] * len(address.FIELDS)
+        columns.update(zip(address.FIELDS, map(list, values)))
+        return columns
+
+    def parse_single_street(self, text: str) -> "ParseResult[address.Address]":
+        return self._parse("full_street", text, self._parse_address)
+
+    def parse_batch(self, texts: Iterable[str]) -> List[List[address.Address]]:
+        """Parses many texts with this parser,
+        returns a list of addresses per text in input order
+        """
+        return [addresses for _, addresses in self.iter_parse_batch(texts)]
+
+    def iter_parse_batch(
+        self, texts: Iterable[str]
+    ) -> Iterator[Tuple[int, List[address.Address]]]:
+        """Yields (index, addresses) pairs as soon as each text is parsed"""
+        for index, text in enumerate(texts):
+            yield index, self.parse(text)
+
+    def _parse(
+        self,
+        name: str,
+        text: str,
+        build: Callable[[re.Match[str], Tuple[int, int]], _T],
+        prefilter: bool = False,
+        anchored: bool = False,
+        budget: Optional[_Budget] = None,
+    ) -> "ParseResult[_T]":
+        results: ParseResult[_T] = ParseResult()
+        # per-call state stays local, parsers can be shared between threads
+        clean_text = self._normalize_string(text)
+        # the prefilter scans the whole text at once, with a budget the
+        # search takes steps of SCAN_WINDOW characters only
+        if (
+            prefilter
+            and budget is None
+            and not self.registry.prefilter(self.country, clean_text)
+        ):
+            return results
+        rules = self.registry.get(self.country, name)
 
         # get addresses
-        address_matches = utils.finditer(rules, self.clean_text)
+        windows: Iterable[Tuple[int, int]]
+        if anchored:
+            windows = self._anchor_windows(clean_text, budget)
+        else:
+            windows = [(0, len(clean_text))]
+        if budget is None and not anchored:
+            address_matches = list(rules.finditer(clean_text))
+        else:
+            address_matches = list(
+                self._finditer_windows(rules, clean_text, windows, budget)
+            )
+        # append parsed address info, with offsets in the original text;
+        # most texts hold no address, so offsets are only mapped on demand
+        shifts = offsets.ShiftTable()
         if address_matches:
-            # append parsed address info
-            results = list(map(self._parse_address, address_matches))
+            self._record_shifts(text, shifts)
+        for match in address_matches:
+            results.append(build(match, shifts.span(*match.span())))
 
+        results.truncated = budget is not None and budget.exhausted
         return results
 
-    def _parse_address(self, match: re.Match[str]) -> address.Address:
-        """Parses address into parts"""
-        match_as_dict = match.groupdict()
-        match_as_dict.update({"country_id": self.country})
-        # combine results
-        cleaned_dict = self._combine_results(match_as_dict)
-        cleaned_dict["match_start"] = match.start()
-        cleaned_dict["match_end"] = match.end()
+    def iter_parse(
+        self,
+        stream: Union[TextIO, Iterable[str]],
+        chunk_size: int = STREAM_CHUNK_SIZE,
+        overlap: int = STREAM_OVERLAP,
+    ) -> Iterator[address.Address]:
+        """Yields addresses from a text file (read `chunk_size` characters
+        at a time) or from an iterable of text chunks as soon as they are
+        found, without holding the whole text in memory.
+
+        Addresses crossing chunk boundaries are found as long as they are
+        shorter than `overlap` characters. match_start and match_end are
+        offsets in the whole text read from the stream.
+        """
+        if overlap < 1:
+            raise ValueError("overlap must be a positive number")
+        if isinstance(stream, str):
+            chunks: Iterable[str] = [stream]
+        elif hasattr(stream, "read"):
+            reader = cast(TextIO, stream)
+            chunks = iter(functools.partial(reader.read, chunk_size), "")
+        else:
+            chunks = stream
+        return self.iter_parse_chunks(chunks, overlap)
 
-        # if only parsing a single street the full address is the full street
-        if "full_address" not in cleaned_dict:
-            cleaned_dict["full_address"] = cleaned_dict["full_street"]
+    def iter_parse_chunks(
+        self,
+        chunks: Iterable[str],
+        overlap: int = STREAM_OVERLAP,
+        on_trim: Optional[Callable[[int], None]] = None,
+    ) -> Iterator[address.Address]:
+        """iter_parse() over text chunks; `on_trim` is called with
+        the offset below which no following address starts, so the caller
+        can drop the text it keeps for them
+        """
+        rules = self.registry.get(self.country, "full_address")
+        pending = ""  # raw text, not normalized yet
+        raw_base = 0  # offset of `pending` in the raw text
+        buf = ""  # normalized text from offset `base` of the stream
+        base = 0
+        shifts = offsets.ShiftTable()
+        pos = 0  # offset in the normalized stream where the next search starts
+        for chunk in itertools.chain(chunks, [None]):
+            if chunk is not None:
+                raw = pending + chunk
+                # a run of spaces and commas is normalized as a whole,
+                # it may continue in the next chunk
+                stripped = raw.rstrip(" \t,")
+                pending = raw[len(stripped) :]
+            else:
+                stripped, pending = pending, ""
+            self._record_shifts(
+                stripped, shifts, clean_base=base + len(buf), raw_base=raw_base
+            )
+            buf += self._normalize_string(stripped)
+            raw_base += len(stripped)
+            # a match may still grow into the following text
+            limit = len(buf) - overlap if chunk is not None else len(buf)
+            if limit <= pos - base:
+                continue
 
-        # create object containing results
-        return address.Address(**cleaned_dict)
+            for match in rules.finditer(buf, pos - base):
+                if match.end() > limit:
+                    break
+                span = shifts.span(base + match.start(), base + match.end())
+                yield self._parse_address(match, span)
+                pos = base + match.end()
+            # no address starts before this point, they are shorter than overlap
+            pos = max(pos, base + limit - overlap)
+            cut = max(pos - base - STREAM_CONTEXT, 0)
+            buf = buf[cut:]
+            base += cut
+            shifts.forget(base)
+            if on_trim is not None:
+                on_trim(shifts.original(base))
+
+    def _anchor_windows(
+        self, text: str, budget: Optional[_Budget] = None
+    ) -> Iterator[Tuple[int, int]]:
+        """Spans of text around anchors, where addresses may be, found
+        as the search goes; the anchor search stops at the deadline of
+        the budget but takes none of its steps
+        """
+        anchors = self.registry.get(self.country, "address_anchor")
+        clock = None if budget is None else budget.time_only()
+        if clock is not None and clock.deadline is not None:
+            found = self._finditer_windows(anchors, text, [(0, len(text))], clock)
+        else:
+            found = anchors.finditer(text)
+        window: Optional[Tuple[int, int]] = None
+        for anchor in found:
+            start = max(anchor.start() - ANCHOR_WINDOW_BEFORE, 0)
+            end = min(anchor.end() + ANCHOR_WINDOW_AFTER, len(text))
+            if window is not None and start <= window[1]:
+                window = (window[0], end)
+                continue
+            if window is not None:
+                yield window
+            window = (start, end)
+        if window is not None:
+            yield window
+        if budget is not None and clock is not None and clock.exhausted:
+            budget.exhausted = True
 
     @staticmethod
-    def _combine_results(match_as_dict: Dict[str, Any]) -> Dict[str, Any]:
-        """Combine results from different parsed parts:
-        we look for non-empty results in values like
-        'postal_code_b' or 'postal_code_c' and store
-        them as main value.
-
-        So 'postal_code_b':'123456'
-            becomes:
-           'postal_code'  :'123456'
+    def _finditer_windows(
+        rules: re.Pattern[str],
+        text: str,
+        windows: Iterable[Tuple[int, int]],
+        budget: Optional[_Budget] = None,
+    ) -> Iterator[re.Match[str]]:
+        """Yields the matches of rules.finditer(text) starting in windows.
+        With a budget each step searches SCAN_WINDOW characters (plus
+        SCAN_OVERLAP for matches crossing the piece end) until the budget
+        runs out.
         """
-        keys = []
-        vals = []
-        for k, v in match_as_dict.items():
-            if k[-2:] in "_a_b_c_d_e_f_g_h_i_j_k_l_m":
-                if v:
-                    # strip last 2 chars: '..._b' -> '...'
-                    keys.append(k[:-2])
-                    vals.append(v)
+        pos = 0
+        for start, end in windows:
+            pos = max(pos, start)
+            while pos < end:
+                if budget is None:
+                    piece_end = search_end = end
+                elif not budget.spend():
+                    return
+                else:
+                    piece_end = min(pos + SCAN_WINDOW, end)
+                    search_end = min(piece_end + SCAN_OVERLAP, end)
+                candidate = rules.search(text, pos, search_end)
+                if candidate is None or candidate.start() >= piece_end:
+                    pos = piece_end
+                    continue
+                # the window end may cut a match (or fake one with '$'),
+                # so take the match from the whole text
+                match = (
+                    candidate
+                    if search_end == len(text)
+                    else rules.match(text, candidate.start())
+                )
+                if match is not None:
+                    yield match
+                    pos = max(match.end(), candidate.start() + 1)
+                else:
+                    pos = candidate.start() + 1
+
+    def _parse_address(
+        self, match: re.Match[str], span: Optional[Tuple[int, int]] = None
+    ) -> address.Address:
+        """Parses address into parts"""
+        return address.Address.from_row(self._parse_row(match, span))
+
+    def _parse_row(
+        self, match: re.Match[str], span: Optional[Tuple[int, int]] = None
+    ) -> address.Row:
+        """Parses address into a tuple of parts in address.FIELDS order"""
+        groups = match.groups()
+        start, end = span or match.span()
+        row: List[Any] = [end, start, self.country]
+        for plain, alternatives in _field_groups(match.re):
+            for index in alternatives:
+                value = groups[index]
+                if value:
+                    break
             else:
-                if k not in keys:
-                    keys.append(k)
-                    vals.append(v)
-        return dict(zip(keys, vals))
+                value = None if plain is None else groups[plain]
+            row.append(value.strip(address.STRIP_CHARS) if value else value)
+        return tuple(row)
 
     @staticmethod
     def _normalize_string(text: str) -> str:
@@ -109,21 +483,35 @@ class AddressParser:
         We should keep the newlines as they are
         good indicators for limits of elements.
         """
-        conversion = {
-            r"[\ \t]*(\,[\ \t]*)+": ", ",
-            # replace excessive empty spaces
-            r"\ +": " ",
-            # convert all types of hyphens/dashes to a
-            # simple old-school dash
-            # from http://utf8-chartable.de/unicode-utf8-table.pl?
-            # start=8192&number=128&utf8=string-literal
-            "‐": "-",
-            "‑": "-",
-            "‒": "-",
-            "–": "-",
-            "—": "-",
-            "―": "-",
-        }
-        for find, replace in conversion.items():
-            text = re.sub(find, replace, text, flags=re.UNICODE)
+        for regex, replacement in _NORMALIZE_PASSES:
+            text = regex.sub(replacement, text)
         return text
+
+    @staticmethod
+    def _record_shifts(
+        text: str,
+        shifts: offsets.ShiftTable,
+        clean_base: int = 0,
+        raw_base: int = 0,
+    ) -> None:
+        """Records in `shifts` where the characters of
+        _normalize_string(text) come from. `clean_base` and `raw_base` are
+        the offsets of the normalized and of the original text in longer
+        texts parsed piece by piece.
+        """
+        clean = clean_base
+        end = 0
+        for match in _SHIFTING.finditer(text):
+            start = match.start()
+            clean += start - end
+            end = match.end()
+            comma = text.find(",", start, end)
+            if comma >= 0:
+                # ', ' points to the first comma of the run
+                shifts.add(clean, raw_base + comma)
+                shifts.add(clean + 1, raw_base + min(comma + 1, end - 1))
+                clean += 2
+            else:
+                # ' ' points to the start of the run, as it did already
+                clean += 1
+            shifts.add(clean, raw_base + end)
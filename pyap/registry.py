@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+
+"""
+    pyap.registry
+    ~~~~~~~~~~~~~~~~
+
+    This module contains a process-wide registry of compiled address
+    detection rules. Every AddressParser takes its patterns from here,
+    so each country grammar is compiled once per process instead of
+    relying on the (small and shared) cache of the `re` module.
+
+    When a cache directory is configured (or the PYAP_CACHE_DIR environment
+    variable is set) generated rules are stored there and reloaded by the
+    following processes without running the rule generator code.
+
+    :copyright: (c) 2015 by Vladimir Goncharov.
+    :license: MIT, see LICENSE for more details.
+"""
+
+import hashlib
+import importlib
+import os
+import re
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from . import cache
+from . import exceptions as e
+from . import utils
+
+COUNTRIES = ("US", "CA", "GB")
+RULES = ("full_address", "full_street", "address_prefilter", "address_anchor")
+
+
+@dataclass(frozen=True)
+class RegistryStats:
+    """Snapshot of the registry counters"""
+
+    hits: int
+    misses: int
+    compile_time: float
+    size: int
+    disk_hits: int = 0
+    prefilter_checks: int = 0
+    prefilter_skips: int = 0
+
+
+class _Counters:
+    """Counters of the lookups made by one thread"""
+
+    __slots__ = ("hits", "prefilter_checks", "prefilter_skips")
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.prefilter_checks = 0
+        self.prefilter_skips = 0
+
+    def add(self, other: "_Counters") -> None:
+        self.hits += other.hits
+        self.prefilter_checks += other.prefilter_checks
+        self.prefilter_skips += other.prefilter_skips
+
+
+# a thread, if it wasn't collected yet, and its counters
+_ThreadCounters = Tuple["weakref.ref[threading.Thread]", _Counters]
+
+
+class PatternRegistry:
+    def __init__(
+        self,
+        flags: re.RegexFlag = utils.DEFAULT_FLAGS,
+        cache_dir: Optional[str] = None,
+    ):
+        self.flags = flags
+        self.cache_dir = cache_dir
+        self._patterns: Dict[Tuple[str, str], re.Pattern[str]] = {}
+        self._fingerprints: Dict[str, str] = {}
+        self._countries: Set[str] = set()
+        self._lock = threading.Lock()
+        # `+=` on shared counters loses updates without the GIL and a lock
+        # around them would serialize every lookup, so each thread counts
+        # its lookups on its own and stats() adds them up; misses are
+        # counted under the compile lock. The counts of exited threads
+        # are added to `_exited`, so short-lived threads don't pile up
+        self._local = threading.local()
+        self._thread_counters: List[_ThreadCounters] = []
+        self._exited = _Counters()
+        self._counters_lock = threading.Lock()
+        self._misses = 0
+        self._disk_hits = 0
+        self._compile_time = 0.0
+
+    def _counters(self) -> _Counters:
+        try:
+            return self._local.counters
+        except AttributeError:
+            counters = self._local.counters = _Counters()
+            thread = weakref.ref(threading.current_thread())
+            with self._counters_lock:
+                self._fold_exited()
+                self._thread_counters.append((thread, counters))
+            return counters
+
+    def _fold_exited(self) -> None:
+        """Adds the counters of exited threads to `_exited` and drops
+        them, called under `_counters_lock`
+        """
+        alive: List[_ThreadCounters] = []
+        for thread_ref, counters in self._thread_counters:
+            thread = thread_ref()
+            if thread is not None and thread.is_alive():
+                alive.append((thread_ref, counters))
+            else:
+                self._exited.add(counters)
+        self._thread_counters = alive
+
+    @property
+    def cache_dir(self) -> Optional[str]:
+        return self._cache.directory if self._cache else None
+
+    @cache_dir.setter
+    def cache_dir(self, directory: Optional[str]) -> None:
+        self._cache = cache.DiskCache(directory) if directory else None
+
+    def check_country(self, country: str) -> None:
+        """Raises CountryDetectionMissing for unsupported countries
+        without importing their rules
+        """
+        if country not in self._countries:
+            cache.rules_origin(country)
+            self._countries.add(country)
+
+    @staticmethod
+    def load_rules(country: str) -> ModuleType:
+        """Returns the module holding detection rules for a country"""
+        try:
+            return importlib.import_module("pyap.source_" + country + ".data")
+        except ImportError:
+            raise e.CountryDetectionMissing(
+                'Detection rules for country "{country}" not found.'.format(
+                    country=country
+                ),
+                "Error 2",
+            )
+
+    def get(self, country: str, name: str) -> re.Pattern[str]:
+        """Returns compiled rule `name` (e.g. 'full_address') of a country"""
+        key = (country, name)
+        pattern = self._patterns.get(key)
+        if pattern is not None:
+            self._counters().hits += 1
+            return pattern
+
+        with self._lock:
+            pattern = self._patterns.get(key)
+            if pattern is not None:
+                self._counters().hits += 1
+                return pattern
+            source = self._load_source(country, name)
+            started = time.perf_counter()
+            pattern = re.compile(source, self.flags)
+            self._compile_time += time.perf_counter() - started
+            self._misses += 1
+            self._patterns[key] = pattern
+        return pattern
+
+    def _load_source(self, country: str, name: str) -> str:
+        if self._cache is None:
+            return getattr(self.load_rules(country), name)
+
+        fingerprint = self._fingerprints.get(country)
+        if fingerprint is None:
+            fingerprint = cache.rules_fingerprint(country, self.flags)
+            self._fingerprints[country] = fingerprint
+        source = self._cache.load(country, name, fingerprint)
+        if source is not None:
+            self._disk_hits += 1
+            return source
+        source = getattr(self.load_rules(country), name)
+        self._cache.store(country, name, fingerprint, source)
+        return source
+
+    def prefilter(
+        self, country: str, text: str, name: str = "address_prefilter"
+    ) -> bool:
+        """Returns False if text can't contain an address of a country,
+        so the full scan can be skipped
+        """
+        passed = self.get(country, name).match(text) is not None
+        counters = self._counters()
+        counters.prefilter_checks += 1
+        if not passed:
+            counters.prefilter_skips += 1
+        return passed
+
+    def warmup(self, countries: Iterable[str] = COUNTRIES) -> None:
+        """Builds and compiles all rules of the given countries"""
+        for country in countries:
+            for name in RULES:
+                self.get(country.upper(), name)
+
+    def fingerprint(self, country: str, name: str = "full_address") -> str:
+        """Returns a digest of the rule source, equal in every process
+        running the same grammar
+        """
+        source = self.get(country.upper(), name).pattern
+        return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+    def stats(self) -> RegistryStats:
+        """Counters of all threads, exact once the counted calls returned"""
+        with self._lock, self._counters_lock:
+            self._fold_exited()
+            counters = [self._exited] + [c for _, c in self._thread_counters]
+            return RegistryStats(
+                hits=sum(c.hits for c in counters),
+                misses=self._misses,
+                compile_time=self._compile_time,
+                size=len(self._patterns),
+                disk_hits=self._disk_hits,
+                prefilter_checks=sum(c.prefilter_checks for c in counters),
+                prefilter_skips=sum(c.prefilter_skips for c in counters),
+            )
+
+    def clear(self) -> None:
+        """Drops compiled patterns and resets counters"""
+        with self._lock, self._counters_lock:
+            self._patterns.clear()
+            for counters in [self._exited] + [c for _, c in self._thread_counters]:
+                counters.hits = 0
+                counters.prefilter_checks = 0
+                counters.prefilter_skips = 0
+            self._misses = 0
+            self._disk_hits = 0
+            self._compile_time = 0.0
+
+
+# registry shared by all parsers of the process
+registry = PatternRegistry(cache_dir=os.environ.get("PYAP_CACHE_DIR"))
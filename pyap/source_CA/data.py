@@ -8,7 +8,8 @@
     detecting Canada addresses.
 
     The module is expected to always contain 'full_address' variable containing
-    all address parsing definitions.
+    all address parsing definitions. 'full_street' and 'full_address' are
+    built on first access.
 
     :copyright: (c) 2015 by Vladimir Goncharov.
     :license: MIT, see LICENSE for more details.
@@ -16,50 +17,62 @@
 
 import re
 
+from .. import utils
+
 """ Numerals from one to nine
-Note: here and below we use syntax like '[Oo][Nn][Ee]'
-instead of '(one)(?i)' to match 'One' or 'oNe' because
-Python Regexps don't seem to support turning On/Off
-case modes for subcapturing groups.
-"""
-zero_to_nine = r"""(?:
-    [Zz][Ee][Rr][Oo]\ |[Oo][Nn][Ee]\ |[Tt][Ww][Oo]\ |
-    [Tt][Hh][Rr][Ee][Ee]\ |[Ff][Oo][Uu][Rr]\ |
-    [Ff][Ii][Vv][Ee]\ |[Ss][Ii][Xx]\ |
-    [Ss][Ee][Vv][Ee][Nn]\ |[Ee][Ii][Gg][Hh][Tt]\ |
-    [Nn][Ii][Nn][Ee]\ |[Tt][Ee][Nn]\ |
-    [Ee][Ll][Ee][Vv][Ee][Nn]\ |
-    [Tt][Ww][Ee][Ll][Vv][Ee]\ |
-    [Tt][Hh][Ii][Rr][Tt][Ee][Ee][Nn]\ |
-    [Ff][Oo][Uu][Rr][Tt][Ee][Ee][Nn]\ |
-    [Ff][Ii][Ff][Tt][Ee][Ee][Nn]\ |
-    [Ss][Ii][Xx][Tt][Ee][Ee][Nn]\ |
-    [Ss][Ee][Vv][Ee][Nn][Tt][Ee][Ee][Nn]\ |
-    [Ee][Ii][Gg][Hh][Tt][Ee][Ee][Nn]\ |
-    [Nn][Ii][Nn][Ee][Tt][Ee][Ee][Nn]\ 
-    )
+Note: here and below we use scoped flags like '(?ai:one)'
+to match 'One' or 'oNe' because the global '(?i)' flag
+would make the whole expression case insensitive. The 'a' flag
+keeps case folding to ASCII letters, so e.g. the long s 'ſ' doesn't
+match 's'.
 """
+zero_to_nine_list = [
+    r"Zero\ ",
+    r"One\ ",
+    r"Two\ ",
+    r"Three\ ",
+    r"Four\ ",
+    r"Five\ ",
+    r"Six\ ",
+    r"Seven\ ",
+    r"Eight\ ",
+    r"Nine\ ",
+    r"Ten\ ",
+    r"Eleven\ ",
+    r"Twelve\ ",
+    r"Thirteen\ ",
+    r"Fourteen\ ",
+    r"Fifteen\ ",
+    r"Sixteen\ ",
+    r"Seventeen\ ",
+    r"Eighteen\ ",
+    r"Nineteen\ ",
+]
+zero_to_nine = utils.str_list_to_trie_regex(zero_to_nine_list)
 
 # Numerals - 10, 20, 30 ... 90
-ten_to_ninety = r"""(?:
-    [Tt][Ee][Nn]\ |[Tt][Ww][Ee][Nn][Tt][Yy]\ |
-    [Tt][Hh][Ii][Rr][Tt][Yy]\ |
-    [Ff][Oo][Rr][Tt][Yy]\ |
-    [Ff][Oo][Uu][Rr][Tt][Yy]\ |
-    [Ff][Ii][Ff][Tt][Yy]\ |[Ss][Ii][Xx][Tt][Yy]\ |
-    [Ss][Ee][Vv][Ee][Nn][Tt][Yy]\ |
-    [Ee][Ii][Gg][Hh][Tt][Yy]\ |
-    [Nn][Ii][Nn][Ee][Tt][Yy]\ 
-    )"""
+ten_to_ninety_list = [
+    r"Ten\ ",
+    r"Twenty\ ",
+    r"Thirty\ ",
+    r"Forty\ ",
+    r"Fourty\ ",
+    r"Fifty\ ",
+    r"Sixty\ ",
+    r"Seventy\ ",
+    r"Eighty\ ",
+    r"Ninety\ ",
+]
+ten_to_ninety = utils.str_list_to_trie_regex(ten_to_ninety_list)
 
 # One hundred
 hundred = r"""(?:
-    [Hh][Uu][Nn][Dd][Rr][Ee][Dd]\ 
+    (?ai:hundred)\ 
     )"""
 
 # One thousand
 thousand = r"""(?:
-    [Tt][Hh][Oo][Uu][Ss][Aa][Nn][Dd]\ 
+    (?ai:thousand)\ 
     )"""
 
 """
@@ -75,7 +88,7 @@ Street number can be written 2 ways:
 """
 street_number = r"""(?<![\.0-9])(?P<street_number>
                         (?:
-                            [Aa][Nn][Dd]\ 
+                            (?ai:and)\ 
                             |
                             {thousand}
                             |
@@ -116,23 +129,23 @@ post_direction = r"""
                     (?P<post_direction>
                         (?:
                             # English
-                            [Nn][Oo][Rr][Tt][Hh]{d}|
-                            [Ss][Oo][Uu][Tt][Hh]{d}|
-                            [Ee][Aa][Ss][Tt]{d}|
-                            [Ww][Ee][Ss][Tt]{d}|
-                            [Nn][Oo][Rr][Tt][Hh][Ee][Aa][Ss][Tt]{d}|
-                            [Nn][Oo][Rr][Tt][Hh][Ww][Ee][Ss][Tt]{d}|
-                            [Ss][Oo][Uu][Tt][Hh][Ee][Aa][Ss][Tt]{d}|
-                            [Ss][Oo][Uu][Tt][Hh][Ww][Ee][Ss][Tt]{d}|
+                            (?ai:north){d}|
+                            (?ai:south){d}|
+                            (?ai:east){d}|
+                            (?ai:west){d}|
+                            (?ai:northeast){d}|
+                            (?ai:northwest){d}|
+                            (?ai:southeast){d}|
+                            (?ai:southwest){d}|
                             # French
-                            [Ee][Ss][Tt]{d}|
-                            [Nn][Oo][Rr][Dd]{d}|
-                            [Nn][Oo][Rr][Dd]\-[Ee][Ss][Tt]{d}|
-                            [Nn][Oo][Rr][Dd]\-[Oo][Uu][Ee][Ss][Tt]{d}|
-                            [Ss][Uu][Dd]{d}|
-                            [Ss][Uu][Dd]\-[Ee][Ss][Tt]{d}|
-                            [Ss][Uu][Dd]\-[Oo][Uu][Ee][Ss][Tt]{d}|
-                            [Oo][Uu][Ee][Ss][Tt]{d}
+                            (?ai:est){d}|
+                            (?ai:nord){d}|
+                            (?ai:nord\-est){d}|
+                            (?ai:nord\-ouest){d}|
+                            (?ai:sud){d}|
+                            (?ai:sud\-est){d}|
+                            (?ai:sud\-ouest){d}|
+                            (?ai:ouest){d}
                         )
                         |
                         (?:
@@ -156,170 +169,236 @@ post_direction = r"""
 # Regexp for matching street type
 # According to
 # https://www.canadapost.ca/tools/pg/manual/PGaddress-e.asp#1385939
+street_type_list = [
+    "Abbey",
+    "Acres",
+    "Allée",
+    "Alley",
+    "Autoroute",
+    "Aut",
+    "Avenue",
+    "Ave",
+    "Av",
+    "Bay",
+    "Beach",
+    "Bend",
+    r"Bouleva(?-i:[Er])d",
+    "Blvd",
+    "Boul",
+    "Broadway",
+    r"By\-pass",
+    "Bypass",
+    "Byway",
+    "Campus",
+    "Cape",
+    r"Carr(?-i:[EéÉ])",
+    "Car",
+    "Carrefour",
+    r"Car(?-i:[Re])ef",
+    "Centre",
+    "Ctr",
+    "Cercle",
+    "Chase",
+    "Chemin",
+    "Ch",
+    "Circle",
+    "Cir",
+    "Circuit",
+    "Circt",
+    "Close",
+    "Common",
+    "Concession",
+    "Conc",
+    "Corners",
+    "Côte",
+    "Cours",
+    "Cour",
+    "Court",
+    "Crt",
+    "Cove",
+    "Crescent",
+    "Cres",
+    "Croissant",
+    "Crois",
+    "Crossing",
+    "Cross",
+    r"Cul\-de\-sac",
+    "Cds",
+    "Dale",
+    "Dell",
+    "Diversion",
+    "Divers",
+    "Downs",
+    "Drive",
+    "Dr",
+    r"(?-i:[Ée])changeur",
+    r"(?-i:[Ée])ch",
+    "End",
+    "Esplanade",
+    "Espl",
+    "Estates",
+    "Estate",
+    "Expressway",
+    "Expy",
+    "Extension",
+    "Exten",
+    "Farm",
+    "Field",
+    "Forest",
+    "Freeway",
+    "Fwy",
+    "Front",
+    "Gardens",
+    "Gdns",
+    "Gate",
+    "Glade",
+    "Glen",
+    "Green",
+    r"Gr(?-i:[Uo])unds",
+    "Grnds",
+    "Grove",
+    "Harbour",
+    "Harbr",
+    "Heath",
+    "Heights",
+    "Hts",
+    "Highlands",
+    r"Hghld(?-i:[Sd])",
+    r"Hig(?-i:[Gh])way",
+    "Hwy",
+    "Hill",
+    "Hollow",
+    r"(?-i:[Îi])le",
+    "Impasse",
+    r"(?-i:[I])mp",
+    "Inlet",
+    "Island",
+    "Key",
+    "Knoll",
+    "Landing",
+    "Landng",
+    "Lane",
+    "Limits",
+    "Lmts",
+    "Line",
+    "Link",
+    "Lookout",
+    "Lkout",
+    "Mainway",
+    "Mall",
+    "Manor",
+    "Maze",
+    "Meadow",
+    "Mews",
+    "Montée",
+    "Moor",
+    "Mountain",
+    "Mtn",
+    "Mount",
+    "Orchard",
+    "Orch",
+    "Parade",
+    "Parc",
+    "Parkway",
+    "Pky",
+    "Park",
+    "Pk",
+    "Passage",
+    r"P(?-i:[As])ss",
+    "Path",
+    "Pathway",
+    "Ptway",
+    "Pines",
+    "Place",
+    "Pl",
+    "Plateau",
+    "Plat",
+    "Plaza",
+    "Pointe",
+    "Point",
+    "Pt",
+    "Port",
+    "Private",
+    "Pvt",
+    "Promenade",
+    "Prom",
+    "Quai",
+    "Quay",
+    "Ramp",
+    "Range",
+    "Rg",
+    "Rang",
+    "Ridge",
+    "Rise",
+    "Road",
+    "Rd",
+    r"Rond\-point",
+    "Rdpt",
+    "Route",
+    "Rte",
+    "Row",
+    "Ruelle",
+    "Rle",
+    "Rue",
+    "Run",
+    "Sentier",
+    "Sent",
+    "Street",
+    "St",
+    "Str",
+    "Square",
+    "Sq",
+    "Subdivision",
+    "Subdiv",
+    "Terrace",
+    r"Te(?-i:[Re][Re])",
+    "Terrasse",
+    r"Tss(?-i:[Es])",
+    "Thicket",
+    "Thick",
+    "Towers",
+    "Townline",
+    "Tline",
+    "Trail",
+    "Turnabout",
+    "Trnabt",
+    "Vale",
+    "Via",
+    "View",
+    "Village",
+    "Villge",
+    "Villas",
+    "Vista",
+    "Voie",
+    r"Wal(?-i:[Lk])",
+    "Way",
+    "Wharf",
+    "Wood",
+    "Wynd",
+]
+
 street_type = r"""
             (?P<street_type>
-                [Aa][Bb][Bb][Ee][Yy]{div}|
-                [Aa][Cc][Rr][Ee][Ss]{div}|
-                [Aa][Ll][Ll][Éé][Ee]{div}|
-                [Aa][Ll][Ll][Ee][Yy]{div}|
-                [Aa][Uu][Tt][Oo][Rr][Oo][Uu][Tt][Ee]{div}|[Aa][Uu][Tt]{div}|
-                [Aa][Vv][Ee][Nn][Uu][Ee]{div}|[Aa][Vv][Ee]?{div}|
-                [Bb][Aa][Yy]{div}|
-                [Bb][Ee][Aa][Cc][Hh]{div}|
-                [Bb][Ee][Nn][Dd]{div}|
-                [Bb][Oo][Uu][Ll][Ee][Vv][Aa][Er][Dd]{div}|[Bb][Ll][Vv][Dd]{div}|[Bb][Oo][Uu][Ll]{div}|
-                # Broadway
-                [Bb][Rr][Oo][Aa][Dd][Ww][Aa][Yy]{div}|
-                [Bb][Yy]\-?[Pp][Aa][Ss][Ss]{div}|
-                [Bb][Yy][Ww][Aa][Yy]{div}|
-                [Cc][Aa][Mm][Pp][Uu][Ss]{div}|
-                [Cc][Aa][Pp][Ee]{div}|
-                [Cc][Aa][Rr][Rr][EéÉ]{div}|[Cc][Aa][Rr]{div}|
-                [Cc][Aa][Rr][Rr][Ee][Ff][Oo][Uu][Rr]{div}|[Cc][Aa][Rr][Re][Ee][Ff]{div}|
-                [Cc][Ee][Nn][Tt][Rr][Ee]{div}|[Cc][Tt][Rr]{div}|
-                [Cc][Ee][Rr][Cc][Ll][Ee]{div}|
-                [Cc][Hh][Aa][Ss][Ee]{div}|
-                [Cc][Hh][Ee][Mm][Ii][Nn]{div}|[Cc][Hh]{div}|
-                [Cc][Ii][Rr][Cc][Ll][Ee]{div}|[Cc][Ii][Rr]{div}|
-                [Cc][Ii][Rr][Cc][Uu][Ii][Tt]{div}|[Cc][Ii][Rr][Cc][Tt]{div}|
-                [Cc][Ll][Oo][Ss][Ee]{div}|
-                [Cc][Oo][Mm][Mm][Oo][Nn]{div}|
-                [Cc][Oo][Nn][Cc][Ee][Ss][Ss][Ii][Oo][Nn]{div}|[Cc][Oo][Nn][Cc]{div}|
-                [Cc][Oo][Rr][Nn][Ee][Rr][Ss]{div}|
-                [Cc][Ôô][Tt][Ee]{div}|
-                [Cc][Oo][Uu][Rr][Ss]{div}|
-                [Cc][Oo][Uu][Rr]{div}|
-                [Cc][Oo][Uu][Rr][Tt]{div}|[Cc][Rr][Tt]{div}|
-                [Cc][Oo][Vv][Ee]{div}|
-                [Cc][Rr][Ee][Ss][Cc][Ee][Nn][Tt]{div}|[Cc][Rr][Ee][Ss]{div}|
-                [Cc][Rr][Oo][Ii][Ss][Ss][Aa][Nn][Tt]{div}|[Cc][Rr][Oo][Ii][Ss]{div}|
-                [Cc][Rr][Oo][Ss][Ss][Ii][Nn][Gg]{div}|[Cc][Rr][Oo][Ss][Ss]{div}|
-                [Cc][Uu][Ll]\-[Dd][Ee]\-[Ss][Aa][Cc]{div}|[Cc][Dd][Ss]{div}|
-                [Dd][Aa][Ll][Ee]{div}|
-                [Dd][Ee][Ll][Ll]{div}|
-                [Dd][Ii][Vv][Ee][Rr][Ss][Ii][Oo][Nn]{div}|[Dd][Ii][Vv][Ee][Rr][Ss]{div}|
-                [Dd][Oo][Ww][Nn][Ss]{div}|
-                [Dd][Rr][Ii][Vv][Ee]{div}|[Dd][Rr]{div}|
-                [Ée][Cc][Hh][Aa][Nn][Gg][Ee][Uu][Rr]{div}|[Ée][Cc][Hh]{div}|
-                [Ee][Nn][Dd]{div}|
-                [Ee][Ss][Pp][Ll][Aa][Nn][Aa][Dd][Ee]{div}|[Ee][Ss][Pp][Ll]{div}|
-                [Ee][Ss][Tt][Aa][Tt][Ee][Ss]?{div}|
-                [Ee][Xx][Pp][Rr][Ee][Ss][Ss][Ww][Aa][Yy]{div}|[Ee][Xx][Pp][Yy]{div}|
-                [Ee][Xx][Tt][Ee][Nn][Ss][Ii][Oo][Nn]{div}|[Ee][Xx][Tt][Ee][Nn]{div}|
-                [Ff][Aa][Rr][Mm]{div}|
-                [Ff][Ii][Ee][Ll][Dd]{div}|
-                [Ff][Oo][Rr][Ee][Ss][Tt]{div}|
-                [Ff][Rr][Ee][Ee][Ww][Aa][Yy]{div}|[Ff][Ww][Yy]{div}|
-                [Ff][Rr][Oo][Nn][Tt]{div}|
-                [Gg][Aa][Rr][Dd][Ee][Nn][Ss]{div}|[Gg][Dd][Nn][Ss]{div}|
-                [Gg][Aa][Tt][Ee]{div}|
-                [Gg][Ll][Aa][Dd][Ee]{div}|
-                [Gg][Ll][Ee][Nn]{div}|
-                [Gg][Rr][Ee][Ee][Nn]{div}|
-                [Gg][Rr][Uo][Uu][Nn][Dd][Ss]{div}|[Gg][Rr][Nn][Dd][Ss]{div}|
-                [Gg][Rr][Oo][Vv][Ee]{div}|
-                [Hh][Aa][Rr][Bb][Oo][Uu][Rr]{div}|[Hh][Aa][Rr][Bb][Rr]{div}|
-                [Hh][Ee][Aa][Tt][Hh]{div}|
-                [Hh][Ee][Ii][Gg][Hh][Tt][Ss]{div}|[Hh][Tt][Ss]{div}|
-                [Hh][Ii][Gg][Hh][Ll][Aa][Nn][Dd][Ss]{div}|[Hh][Gg][Hh][Ll][Dd][Sd]{div}|
-                [Hh][Ii][Gg][Gh][Ww][Aa][Yy]{div}|[Hh][Ww][Yy]{div}|
-                [Hh][Ii][Ll][Ll]{div}|
-                [Hh][Oo][Ll][Ll][Oo][Ww]{div}|
-                [Îi][Ll][Ee]{div}|
-                [Ii][Mm][Pp][Aa][Ss][Ss][Ee]{div}|I[Mm][Pp]{div}|
-                [Ii][Nn][Ll][Ee][Tt]{div}|
-                [Ii][Ss][Ll][Aa][Nn][Dd]{div}|
-                [Kk][Ee][Yy]{div}|
-                [Kk][Nn][Oo][Ll][Ll]{div}|
-                [Ll][Aa][Nn][Dd][Ii][Nn][Gg]{div}|[Ll][Aa][Nn][Dd][Nn][Gg]{div}|
-                [Ll][Aa][Nn][Ee]{div}|
-                [Ll][Ii][Mm][Ii][Tt][Ss]{div}|[Ll][Mm][Tt][Ss]{div}|
-                [Ll][Ii][Nn][Ee]{div}|
-                [Ll][Ii][Nn][Kk]{div}|
-                [Ll][Oo][Oo][Kk][Oo][Uu][Tt]{div}|[Ll][Kk][Oo][Uu][Tt]{div}|
-                [Mm][Aa][Ii][Nn][Ww][Aa][Yy]{div}|
-                [Mm][Aa][Ll][Ll]{div}|
-                [Mm][Aa][Nn][Oo][Rr]{div}|
-                [Mm][Aa][Zz][Ee]{div}|
-                [Mm][Ee][Aa][Dd][Oo][Ww]{div}|
-                [Mm][Ee][Ww][Ss]{div}|
-                [Mm][Oo][Nn][Tt][Éé][Ee]{div}|
-                [Mm][Oo][Oo][Rr]{div}|
-                [Mm][Oo][Uu][Nn][Tt][Aa][Ii][Nn]{div}|[Mm][Tt][Nn]{div}|
-                [Mm][Oo][Uu][Nn][Tt]{div}|
-                [Oo][Rr][Cc][Hh][Aa][Rr][Dd]{div}|[Oo][Rr][Cc][Hh]{div}|
-                [Pp][Aa][Rr][Aa][Dd][Ee]{div}|
-                [Pp][Aa][Rr][Cc]{div}|
-                [Pp][Aa][Rr][Kk][Ww][Aa][Yy]{div}|[Pp][Kk][Yy]{div}|
-                [Pp][Aa][Rr][Kk]{div}|[Pp][Kk]{div}|
-                [Pp][Aa][Ss][Ss][Aa][Gg][Ee]{div}|[Pp][As][Ss][Ss]{div}|
-                [Pp][Aa][Tt][Hh]{div}|
-                [Pp][Aa][Tt][Hh][Ww][Aa][Yy]{div}|[Pp][Tt][Ww][Aa][Yy]{div}|
-                [Pp][Ii][Nn][Ee][Ss]{div}|
-                [Pp][Ll][Aa][Cc][Ee]{div}|[Pp][Ll]{div}|
-                [Pp][Ll][Aa][Tt][Ee][Aa][Uu]{div}|[Pp][Ll][Aa][Tt]{div}|
-                [Pp][Ll][Aa][Zz][Aa]{div}|
-                [Pp][Oo][Ii][Nn][Tt][Ee]{div}|
-                [Pp][Oo][Ii][Nn][Tt]{div}|[Pp][Tt]{div}|
-                [Pp][Oo][Rr][Tt]{div}|
-                [Pp][Rr][Ii][Vv][Aa][Tt][Ee]{div}|[Pp][Vv][Tt]{div}|
-                [Pp][Rr][Oo][Mm][Ee][Nn][Aa][Dd][Ee]{div}|[Pp][Rr][Oo][Mm]{div}|
-                [Qq][Uu][Aa][Ii]{div}|
-                [Qq][Uu][Aa][Yy]{div}|
-                [Rr][Aa][Mm][Pp]{div}|
-                [Rr][Aa][Nn][Gg][Ee]{div}|[Rr][Gg]{div}|
-                [Rr][Aa][Nn][Gg]{div}|
-                [Rr][Ii][Dd][Gg][Ee]{div}|
-                [Rr][Ii][Ss][Ee]{div}|
-                [Rr][Oo][Aa][Dd]{div}|[Rr][Dd]{div}|
-                [Rr][Oo][Nn][Dd]\-[Pp][Oo][Ii][Nn][Tt]{div}|[Rr][Dd][Pp][Tt]{div}|
-                [Rr][Oo][Uu][Tt][Ee]{div}|[Rr][Tt][Ee]{div}|
-                [Rr][Oo][Ww]{div}|
-                [Rr][Uu][Ee][Ll][Ll][Ee]{div}|[Rr][Ll][Ee]{div}|
-                [Rr][Uu][Ee]{div}|
-                [Rr][Uu][Nn]{div}|
-                [Ss][Ee][Nn][Tt][Ii][Ee][Rr]{div}|[Ss][Ee][Nn][Tt]{div}|
-                # Street
-                [Ss][Tt][Rr][Ee][Ee][Tt]{div}|[Ss][Tt]{div}|[Ss][Tt][Rr]{div}|
-                # Square
-                [Ss][Qq][Uu][Aa][Rr][Ee]{div}|[Ss][Qq]{div}|
-                [Ss][Uu][Bb][Dd][Ii][Vv][Ii][Ss][Ii][Oo][Nn]{div}|[Ss][Uu][Bb][Dd][Ii][Vv]{div}|
-                [Tt][Ee][Rr][Rr][Aa][Cc][Ee]{div}|[Tt][Ee][Re][Re]{div}|
-                [Tt][Ee][Rr][Rr][Aa][Ss][Ss][Ee]{div}|[Tt][Ss][Ss][Es]{div}|
-                [Tt][Hh][Ii][Cc][Kk][Ee][Tt]{div}|[Tt][Hh][Ii][Cc][Kk]{div}|
-                [Tt][Oo][Ww][Ee][Rr][Ss]{div}|
-                [Tt][Oo][Ww][Nn][Ll][Ii][Nn][Ee]{div}|[Tt][Ll][Ii][Nn][Ee]{div}|
-                [Tt][Rr][Aa][Ii][Ll]{div}|
-                [Tt][Uu][Rr][Nn][Aa][Bb][Oo][Uu][Tt]{div}|[Tt][Rr][Nn][Aa][Bb][Tt]{div}|
-                [Vv][Aa][Ll][Ee]{div}|
-                [Vv][Ii][Aa]{div}|
-                [Vv][Ii][Ee][Ww]{div}|
-                [Vv][Ii][Ll][Ll][Aa][Gg][Ee]{div}|[Vv][Ii][Ll][Ll][Gg][Ee]{div}|
-                [Vv][Ii][Ll][Ll][Aa][Ss]{div}|
-                [Vv][Ii][Ss][Tt][Aa]{div}|
-                [Vv][Oo][Ii][Ee]{div}|
-                [Ww][Aa][Ll][Lk]{div}|
-                [Ww][Aa][Yy]{div}|
-                [Ww][Hh][Aa][Rr][Ff]{div}|
-                [Ww][Oo][Oo][Dd]{div}|
-                [Ww][Yy][Nn][Dd]{div}
+                (?:{street_types}){div}
             )
             (?P<route_id>
                 [\(\ \,]{route_symbols}
-                [Rr][Oo][Uu][Tt][Ee]\ [A-Za-z0-9]+[\)\ \,]{route_symbols}
+                (?ai:route)\ [A-Za-z0-9]+[\)\ \,]{route_symbols}
             )?
             """.format(
-    div="[\.\ ,]{0,2}", route_symbols="{0,3}"
+    street_types=utils.str_list_to_regex(street_type_list),
+    div="[\.\ ,]{0,2}",
+    route_symbols="{0,3}",
 )
 
 floor = r"""
             (?P<floor>
                 (?:
-                \d+[A-Za-z]{0,2}\.?\ [Ff][Ll][Oo][Oo][Rr]\ 
+                \d+[A-Za-z]{0,2}\.?\ (?ai:floor)\ 
                 )
                 |
                 (?:
-                    [Ff][Ll][Oo][Oo][Rr]\ \d+[A-Za-z]{0,2}\ 
+                    (?ai:floor)\ \d+[A-Za-z]{0,2}\ 
                 )
             )
         """
@@ -327,9 +406,9 @@ floor = r"""
 building = r"""
             (?:
                 (?:
-                    (?:[Bb][Uu][Ii][Ll][Dd][Ii][Nn][Gg])
+                    (?ai:building)
                     |
-                    (?:[Bb][Ll][Dd][Gg])
+                    (?ai:bldg)
                 )
                 \ \d{0,2}[A-Za-z]?
             )
@@ -343,28 +422,28 @@ occupancy = r"""
                         # English
                         #
                         # Suite
-                        [Ss][Uu][Ii][Tt][Ee]\ |[Ss][Tt][Ee]\.?\ 
+                        (?ai:suite)\ |(?ai:ste)\.?\ 
                         |
                         # Apartment
-                        [Aa][Pp][Tt]\.?\ |[Aa][Pp][Aa][Rr][Tt][Mm][Ee][Nn][Tt]\ 
+                        (?ai:apt)\.?\ |(?ai:apartment)\ 
                         |
                         # Room
-                        [Rr][Oo][Oo][Mm]\ |[Rr][Mm]\.?\ 
+                        (?ai:room)\ |(?ai:rm)\.?\ 
                         |
                         # Unit
-                        [Uu][Nn][Ii][Tt]\ 
+                        (?ai:unit)\ 
                         |
                         #
                         # French
                         #
                         # Apartement
-                        [Aa][Pp][Aa][Rr][Tt][Ee][Mm][Ee][Nn][Tt]\ |A[Pp][Pp]\ 
+                        (?ai:apartement)\ |A(?ai:pp)\ 
                         |
                         # Bureau
-                        [Bb][Uu][Rr][Ee][Aa][Uu]\ 
+                        (?ai:bureau)\ 
                         |
                         # Unité
-                        [Uu][Nn][Ii][Tt][Éé]\ 
+                        (?ai:unit[éÉ])\ 
                     )
                     (?:
                         [A-Za-z\#\&\-\d]{1,7}
@@ -380,7 +459,7 @@ occupancy = r"""
 po_box = r"""
             (?:
                 # English - PO Box 123
-                (?:[Pp]\.?\ ?[Oo]\.?\ [Bb][Oo][Xx]\ \d+)
+                (?:[Pp]\.?\ ?[Oo]\.?\ (?ai:box)\ \d+)
                 |
                 # French - B.P. 123
                 (?:[Bb]\.?\ [Pp]\.?\ \d+)
@@ -389,10 +468,10 @@ po_box = r"""
                 (?:[Cc]\.?\ [Pp]\.?\ \d+)
                 |
                 # Case postale 123
-                (?:[Cc]ase\ [Pp][Oo][Ss][Tt][Aa][Ll][Ee]\ \d+)
+                (?:[Cc]ase\ (?ai:postale)\ \d+)
                 |
                 # C.P. 123
-                (?:[Cc]\.[Pp]\.\ \d+)
+                (?:(?ai:c\.p)\.\ \d+)
             )
         """
 
@@ -408,7 +487,7 @@ post_direction_b = re.sub("<([a-z\_]+)>", r"<\1_b>", post_direction)
 po_box_positive_lookahead = r"""
             (?=
                 # English - PO Box 123
-                (?:[Pp]\.?\ ?[Oo]\.?\ [Bb][Oo][Xx]\ \d+)
+                (?:[Pp]\.?\ ?[Oo]\.?\ (?ai:box)\ \d+)
                 |
                 # French - B.P. 123
                 (?:[Bb]\.?\ [Pp]\.?\ \d+)
@@ -417,16 +496,18 @@ po_box_positive_lookahead = r"""
                 (?:[Cc]\.?\ [Pp]\.?\ \d+)
                 |
                 # Case postale 123
-                (?:[Cc]ase\ [Pp][Oo][Ss][Tt][Aa][Ll][Ee]\ \d+)
+                (?:[Cc]ase\ (?ai:postale)\ \d+)
                 |
                 # C.P. 123
-                (?:[Cc]\.[Pp]\.\ \d+)
+                (?:(?ai:c\.p)\.\ \d+)
                 |
                 (?:[\ \,])
             )
         """
 
-full_street = r"""
+
+def make_full_street() -> str:
+    return r"""
     (?:
         # Format commonly used in French
         (?P<full_street_b>
@@ -465,22 +546,23 @@ full_street = r"""
             )
         )
     )""".format(
-    street_number=street_number,
-    street_number_b=street_number_b,
-    street_name=street_name,
-    street_name_b=street_name_b,
-    street_type=street_type,
-    street_type_b=street_type_b,
-    post_direction=post_direction,
-    post_direction_b=post_direction_b,
-    floor=floor,
-    building=building,
-    occupancy=occupancy,
-    po_box=po_box,
-    po_box_b=po_box_b,
-    po_box_positive_lookahead=po_box_positive_lookahead,
-    div="[\ ,]{1,2}",
-)
+        street_number=street_number,
+        street_number_b=street_number_b,
+        street_name=street_name,
+        street_name_b=street_name_b,
+        street_type=street_type,
+        street_type_b=street_type_b,
+        post_direction=post_direction,
+        post_direction_b=post_direction_b,
+        floor=floor,
+        building=building,
+        occupancy=occupancy,
+        po_box=po_box,
+        po_box_b=po_box_b,
+        po_box_positive_lookahead=po_box_positive_lookahead,
+        div="[\ ,]{1,2}",
+    )
+
 
 # region1 here is actually a "province"
 region1 = r"""
@@ -494,36 +576,36 @@ region1 = r"""
             |
             (?:
                 # provinces full (English)
-                [Aa][Ll][Bb][Ee][Rr][Tt][Aa]|
-                [Bb][Rr][Ii][Tt][Ii][Ss][Hh]\ [Cc][Oo][Ll][Uu][Mm][Bb][Ii][Aa]|
-                [Mm][Aa][Nn][Ii][Tt][Oo][Bb][Aa]|
-                [Nn][Ee][Ww]\ [Bb][Rr][Uu][Nn][Ss][Ww][Ii][Cc][Kk]|
-                [Nn][Ee][Ww][Ff][Oo][Uu][Nn][Dd][Ll][Aa][Nn][Dd]\ 
-                [Aa][Nn][Dd]\ [Ll][Aa][Bb][Rr][Aa][Dd][Oo][Rr]|
-                [Nn][Ee][Ww][Ff][Oo][Uu][Nn][Dd][Ll][Aa][Nn][Dd]\ 
-                \&\ [Ll][Aa][Bb][Rr][Aa][Dd][Oo][Rr]|
-                [Nn][Oo][Rr][Tt][Hh][Ww][Ee][Ss][Tt]\ 
-                [Tt][Ee][Rr][Rr][Ii][Tt][Oo][Rr][Ii][Ee][Ss]|
-                [Nn][Oo][Vv][Aa]\ [Ss][Cc][Oo][Tt][Ii][Aa]|
-                [Nn][Uu][Nn][Aa][Vv][Uu][Tt]|
-                [Oo][Nn][Tt][Aa][Rr][Ii][Oo]|
-                [Pp][Rr][Ii][Nn][Cc][Ee]\ [Ee][Dd][Ww][Aa][Rr][Dd]\ 
-                [Ii][Ss][Ll][Aa][Nn][Dd]|
-                [Qq][Uu][Ee][Bb][Ee][Cc]|
-                [Ss][Aa][Ss][Kk][Aa][Tt][Cc][Hh][Ee][Ww][Aa][Nn]|
-                [Yy][Uu][Kk][Oo][Nn]|
+                (?ai:alberta)|
+                (?ai:british\ columbia)|
+                (?ai:manitoba)|
+                (?ai:new\ brunswick)|
+                (?ai:newfoundland)\ 
+                (?ai:and\ labrador)|
+                (?ai:newfoundland)\ 
+                \&\ (?ai:labrador)|
+                (?ai:northwest)\ 
+                (?ai:territories)|
+                (?ai:nova\ scotia)|
+                (?ai:nunavut)|
+                (?ai:ontario)|
+                (?ai:prince\ edward)\ 
+                (?ai:island)|
+                (?ai:quebec)|
+                (?ai:saskatchewan)|
+                (?ai:yukon)|
                 # provinces full (French)
-                [Cc][Oo][Ll][Oo][Mm][Bb][Ii][Ee]\-
-                [Bb][Rr][Ii][Tt][Aa][Nn]{1,2}[Ii][Qq][Eu][Ee]|
-                [Nn][Oo][Uu][Vv][Ee][Aa][Uu]\-[Bb][Rr][Uu][Nn][Ss][Ww][Ii][Cc][Kk]|
-                [Tt][Ee][Rr][Rr][Ee]\-[Nn][Ee][Uu][Vv][Ee]\-
-                [Ee][Tt]\-[Ll][Aa][Bb][Rr][Aa][Dd][Oo][Rr]|
-                [Tt][Ee][Rr][Rr][Ii][Tt][Oo][Ii][Rr][Ee][Ss]\ [Dd][Uu]\ 
-                [Nn][Oo][Rr][Dd]\-[Oo][Uu][Ee][Ss][Tt]|
-                [Nn][Oo][Uu][Vv][Ee][Ll][Ll][Ee]\-[ÉéEe][Cc][Oo][Ss][Ss][Ee]|
-                [ÎîIi][Ll][Ee]\-[Dd][Uu]\-[Pp][Rr][Ii][Nn][Cc][Ee]\-
-                [ÉéEe][Dd][Oo][Uu][Aa][Rr][Dd]|
-                [Qq][Uu][Éé][Bb][Ee][Cc]
+                (?ai:colombie)\-
+                (?ai:britan{1,2}iq)[Eu][Ee]|
+                (?ai:nouveau\-brunswick)|
+                (?ai:terre\-neuve)\-
+                (?ai:et\-labrador)|
+                (?ai:territoires\ du)\ 
+                (?ai:nord\-ouest)|
+                (?ai:nouvelle)\-[ÉéEe](?ai:cosse)|
+                [ÎîIi](?ai:le\-du\-prince)\-
+                [ÉéEe](?ai:douard)|
+                (?ai:qu[éÉ]bec)
             )
         )
         """
@@ -546,7 +628,7 @@ postal_code = r"""
 
 country = r"""
             (?:
-                [Cc][Aa][Nn][Aa][Dd][Aa]
+                (?ai:canada)
             )
             """
 
@@ -554,7 +636,9 @@ country = r"""
 postal_code_b = re.sub("<([a-z\_]+)>", r"<\1_b>", postal_code)
 postal_code_c = re.sub("<([a-z\_]+)>", r"<\1_c>", postal_code)
 
-full_address = r"""
+
+def make_full_address() -> str:
+    return r"""
                 (?P<full_address>
                     {full_street} {div}
                     {city} {div}
@@ -568,13 +652,48 @@ full_address = r"""
                     )
                 )
                 """.format(
-    full_street=full_street,
-    div="[\, ]{,2}",
-    city=city,
-    region1=region1,
-    country=country,
-    country_b=country,
-    postal_code=postal_code,
-    postal_code_b=postal_code_b,
-    postal_code_c=postal_code_c,
-)
+        full_street=__getattr__("full_street"),
+        div="[\, ]{,2}",
+        city=city,
+        region1=region1,
+        country=country,
+        country_b=country,
+        postal_code=postal_code,
+        postal_code_b=postal_code_b,
+        postal_code_c=postal_code_c,
+    )
+
+
+def make_address_prefilter() -> str:
+    """Cheap test that must pass for full_address to match anywhere in a text:
+    a province and a street number, both sub-rules of full_address.
+    Meant for `match`, the lookaheads scan the whole text.
+    """
+    return r"""
+        \A
+        (?=[\s\S]*?{region1})
+        (?=[\s\S]*?{street_number})
+        """.format(
+        region1=region1,
+        street_number=street_number,
+    )
+
+
+def make_address_anchor() -> str:
+    """Text every full_address match contains: a province.
+    The anchored search strategy runs full_address only on the text
+    around these.
+    """
+    return region1
+
+
+_LAZY_RULES = {
+    "full_street": make_full_street,
+    "full_address": make_full_address,
+    "address_prefilter": make_address_prefilter,
+    "address_anchor": make_address_anchor,
+}
+
+
+def __getattr__(name: str) -> str:
+    return utils.build_lazy_rule(globals(), name, _LAZY_RULES)
@@ -8,63 +8,81 @@
     detecting British/GB/UK addresses.
 
     The module is expected to always contain 'full_address' variable containing
-    all address parsing definitions.
+    all address parsing definitions. 'full_street' and 'full_address' are
+    built on first access.
 
     :copyright: (c) 2015 by Vladimir Goncharov.
     :license: MIT, see LICENSE for more details.
 """
 
+from .. import utils
+
 
 """Numerals from one to nine
-Note: here and below we use syntax like '[Oo][Nn][Ee]'
-instead of '(one)(?i)' to match 'One' or 'oNe' because
-Python Regexps don't seem to support turning On/Off
-case modes for subcapturing groups.
+Note: here and below we use scoped flags like '(?ai:one)'
+to match 'One' or 'oNe' because the global '(?i)' flag
+would make the whole expression case insensitive. The 'a' flag
+keeps case folding to ASCII letters, so e.g. the long s 'ſ' doesn't
+match 's'.
 """
+zero_to_nine_list = [
+    r"Zero\ ",
+    r"One\ ",
+    r"Two\ ",
+    r"Three\ ",
+    r"Four\ ",
+    r"Five\ ",
+    r"Six\ ",
+    r"Seven\ ",
+    r"Eight\ ",
+    r"Nine\ ",
+    r"Ten\ ",
+    r"Eleven\ ",
+    r"Twelve\ ",
+    r"Thirteen\ ",
+    r"Fourteen\ ",
+    r"Fifteen\ ",
+    r"Sixteen\ ",
+    r"Seventeen\ ",
+    r"Eighteen\ ",
+    r"Nineteen\ ",
+]
 zero_to_nine = r"""
-                                (?:
-                                    [Zz][Ee][Rr][Oo]\ |[Oo][Nn][Ee]\ |[Tt][Ww][Oo]\ |
-                                    [Tt][Hh][Rr][Ee][Ee]\ |[Ff][Oo][Uu][Rr]\ |
-                                    [Ff][Ii][Vv][Ee]\ |[Ss][Ii][Xx]\ |
-                                    [Ss][Ee][Vv][Ee][Nn]\ |[Ee][Ii][Gg][Hh][Tt]\ |
-                                    [Nn][Ii][Nn][Ee]\ |[Tt][Ee][Nn]\ |
-                                    [Ee][Ll][Ee][Vv][Ee][Nn]\ |
-                                    [Tt][Ww][Ee][Ll][Vv][Ee]\ |
-                                    [Tt][Hh][Ii][Rr][Tt][Ee][Ee][Nn]\ |
-                                    [Ff][Oo][Uu][Rr][Tt][Ee][Ee][Nn]\ |
-                                    [Ff][Ii][Ff][Tt][Ee][Ee][Nn]\ |
-                                    [Ss][Ii][Xx][Tt][Ee][Ee][Nn]\ |
-                                    [Ss][Ee][Vv][Ee][Nn][Tt][Ee][Ee][Nn]\ |
-                                    [Ee][Ii][Gg][Hh][Tt][Ee][Ee][Nn]\ |
-                                    [Nn][Ii][Nn][Ee][Tt][Ee][Ee][Nn]\ 
-                                )
-"""
+                                (?:{numerals})
+""".format(
+    numerals=utils.str_list_to_trie_regex(zero_to_nine_list)
+)
 
 # Numerals - 10, 20, 30 ... 90
+ten_to_ninety_list = [
+    r"Ten\ ",
+    r"Twenty\ ",
+    r"Thirty\ ",
+    r"Forty\ ",
+    r"Fourty\ ",
+    r"Fifty\ ",
+    r"Sixty\ ",
+    r"Seventy\ ",
+    r"Eighty\ ",
+    r"Ninety\ ",
+]
 ten_to_ninety = r"""
-                                (?:
-                                    [Tt][Ee][Nn]\ |[Tt][Ww][Ee][Nn][Tt][Yy]\ |
-                                    [Tt][Hh][Ii][Rr][Tt][Yy]\ |
-                                    [Ff][Oo][Rr][Tt][Yy]\ |
-                                    [Ff][Oo][Uu][Rr][Tt][Yy]\ |
-                                    [Ff][Ii][Ff][Tt][Yy]\ |[Ss][Ii][Xx][Tt][Yy]\ |
-                                    [Ss][Ee][Vv][Ee][Nn][Tt][Yy]\ |
-                                    [Ee][Ii][Gg][Hh][Tt][Yy]\ |
-                                    [Nn][Ii][Nn][Ee][Tt][Yy]\ 
-                                )
-"""
+                                (?:{numerals})
+""".format(
+    numerals=utils.str_list_to_trie_regex(ten_to_ninety_list)
+)
 
 # One hundred
 hundred = r"""
                                 (?:
-                                    [Hh][Uu][Nn][Dd][Rr][Ee][Dd]\ 
+                                    (?ai:hundred)\ 
                                 )
 """
 
 # One thousand
 thousand = r"""
                                 (?:
-                                    [Tt][Hh][Oo][Uu][Ss][Aa][Nn][Dd]\ 
+                                    (?ai:thousand)\ 
                                 )
 """
 
@@ -86,16 +104,16 @@ street_number = r"""
                     (?P<street_number>
                         (?:
                             (?:
-                                [Nn][Uu][Mm][Bb][Ee][Rr]|
+                                (?ai:number)|
                                 [Nn][RrOo]\.?|
-                                [Nn][Uu][Mm]\.?|
+                                (?ai:num)\.?|
                                 #
                             )
                             {space}?
                         )?
                         (?:
                             (?:
-                                [Aa][Nn][Dd]\ 
+                                (?ai:and)\ 
                                 |
                                 {thousand}
                                 |
@@ -143,10 +161,10 @@ street_name = r"""
 post_direction = r"""
                     (?P<post_direction>
                         (?:
-                            [Nn][Oo][Rr][Tt][Hh]\ |
-                            [Ss][Oo][Uu][Tt][Hh]\ |
-                            [Ee][Aa][Ss][Tt]\ |
-                            [Ww][Ee][Ss][Tt]\ 
+                            (?ai:north)\ |
+                            (?ai:south)\ |
+                            (?ai:east)\ |
+                            (?ai:west)\ 
                         )
                         |
                         (?:
@@ -160,70 +178,58 @@ post_direction = r"""
 """
 
 # Regexp for matching street type
+street_type_list = [
+    "Street",
+    "Boulevard",
+    r"Blvd\.?",
+    "Highway",
+    "Broadway",
+    "Freeway",
+    "Causeway",
+    "Expressway",
+    "Way",
+    "Walk",
+    "Lane",
+    "Road",
+    "Avenue",
+    "Circle",
+    "Cove",
+    "Drive",
+    "Parkway",
+    "Park",
+    "Court",
+    "Square",
+    "Loop",
+    "Place",
+    "Parade",
+    "Estate",
+]
+
 street_type = r"""
                     (?:
                         (?P<street_type>
-                            # Street
-                            [Ss][Tt][Rr][Ee][Ee][Tt]|S[Tt]\.?(?![A-Za-z])|
-                            # Boulevard
-                            [Bb][Oo][Uu][Ll][Ee][Vv][Aa][Rr][Dd]|[Bb][Ll][Vv][Dd]\.?|
-                            # Highway
-                            [Hh][Ii][Gg][Hh][Ww][Aa][Yy]|H[Ww][Yy]\.?|
-                            # Broadway
-                            [Bb][Rr][Oo][Aa][Dd][Ww][Aa][Yy]|
-                            # Freeway
-                            [Ff][Rr][Ee][Ee][Ww][Aa][Yy]|
-                            # Causeway
-                            [Cc][Aa][Uu][Ss][Ee][Ww][Aa][Yy]|C[Ss][Ww][Yy]\.?|
-                            # Expressway
-                            [Ee][Xx][Pp][Rr][Ee][Ss][Ss][Ww][Aa][Yy]|
-                            # Way
-                            [Ww][Aa][Yy]|
-                            # Walk
-                            [Ww][Aa][Ll][Kk]|
-                            # Lane
-                            [Ll][Aa][Nn][Ee]|L[Nn]\.?|
-                            # Road
-                            [Rr][Oo][Aa][Dd]|R[Dd]\.?|
-                            # Avenue
-                            [Aa][Vv][Ee][Nn][Uu][Ee]|A[Vv][Ee]\.?|
-                            # Circle
-                            [Cc][Ii][Rr][Cc][Ll][Ee]|C[Ii][Rr]\.?|
-                            # Cove
-                            [Cc][Oo][Vv][Ee]|C[Vv]\.?|
-                            # Drive
-                            [Dd][Rr][Ii][Vv][Ee]|D[Rr]\.?|
-                            # Parkway
-                            [Pp][Aa][Rr][Kk][Ww][Aa][Yy]|P[Kk][Ww][Yy]\.?|
-                            # Park
-                            [Pp][Aa][Rr][Kk]|
-                            # Court
-                            [Cc][Oo][Uu][Rr][Tt]|C[Tt]\.?|
-                            # Square
-                            [Ss][Qq][Uu][Aa][Rr][Ee]|S[Qq]\.?|
-                            # Loop
-                            [Ll][Oo][Oo][Pp]|L[Pp]\.?|
-                            # Place
-                            [Pp][Ll][Aa][Cc][Ee]|P[Ll]\.?|
-                            # Parade
-                            [Pp][Aa][Rr][Aa][Dd][Ee]|P[Ll]\.?|
-                            # Estate
-                            [Ee][Ss][Tt][Aa][Tt][Ee]
+                            {street_types}
+                            |
+                            # abbreviations need a capital first letter
+                            S[Tt]\.?(?![A-Za-z])|H(?ai:wy)\.?|C(?ai:swy)\.?|
+                            L[Nn]\.?|R[Dd]\.?|A(?ai:ve)\.?|C(?ai:ir)\.?|C[Vv]\.?|
+                            D[Rr]\.?|P(?ai:kwy)\.?|C[Tt]\.?|S[Qq]\.?|L[Pp]\.?|
+                            P[Ll]\.?
                         )
                         (?P<route_id>)
                     )  # end street_type
 """.format(
-    route_symbols=r"{0,3}",
+    street_types=utils.str_list_to_trie_regex(street_type_list),
 )
 
 floor = r"""
                     (?P<floor>
                         (?:
-                        \d+[A-Za-z]{0,2}\.?\ [Ff][Ll][Oo][Oo][Rr]\ 
+                        \d+[A-Za-z]{0,2}\.?\ (?ai:floor)\ 
                         )
                         |
                         (?:
-                            [Ff][Ll][Oo][Oo][Rr]\ \d+[A-Za-z]{0,2}\ 
+                            (?ai:floor)\ \d+[A-Za-z]{0,2}\ 
                         )
                     )  # end floor
 """
@@ -231,14 +237,14 @@ floor = r"""
 building = r"""
                     (?P<building_id>
                         (?:
-                            (?:[Bb][Uu][Ii][Ll][Dd][Ii][Nn][Gg])
+                            (?ai:building)
                             |
-                            (?:[Bb][Ll][Dd][Gg])
+                            (?ai:bldg)
                         )
                         \ 
                         (?:
                             (?:
-                                [Aa][Nn][Dd]\ 
+                                (?ai:and)\ 
                                 |
                                 {thousand}
                                 |
@@ -265,19 +271,19 @@ occupancy = r"""
                         (?:
                             (?:
                                 # Suite
-                                [Ss][Uu][Ii][Tt][Ee]|[Ss][Tt][Ee]\.?
+                                (?ai:suite)|(?ai:ste)\.?
                                 |
                                 # Studio
-                                [Ss][Tt][Uu][Dd][Ii][Oo]|[Ss][Tt][UuDd]\.?
+                                (?ai:studio)|(?ai:st)[UuDd]\.?
                                 |
                                 # Apartment
-                                [Aa][Pp][Tt]\.?|[Aa][Pp][Aa][Rr][Tt][Mm][Ee][Nn][Tt]
+                                (?ai:apt)\.?|(?ai:apartment)
                                 |
                                 # Room
-                                [Rr][Oo][Oo][Mm]|[Rr][Mm]\.?
+                                (?ai:room)|(?ai:rm)\.?
                                 |
                                 # Flat
-                                [Ff][Ll][Aa][Tt]
+                                (?ai:flat)
                                 |
                                 \#
                             )
@@ -294,13 +300,15 @@ occupancy = r"""
 
 po_box = r"""
                     (?:
-                        [Pp]\.? {space}? [Oo]\.? {space}? ([Bb][Oo][Xx]{space}?)?\d+
+                        [Pp]\.? {space}? [Oo]\.? {space}? ((?ai:box){space}?)?\d+
                     )
 """.format(
     space=space_pattern,
 )
 
-full_street = r"""
+
+def make_full_street() -> str:
+    return r"""
         (?:
             (?P<full_street>
     
@@ -332,17 +340,18 @@ full_street = r"""
             )
         )  # end full_street
 """.format(
-    street_number=street_number,
-    street_name=street_name,
-    street_type=street_type,
-    post_direction=post_direction,
-    floor=floor,
-    building=building,
-    occupancy=occupancy,
-    po_box=po_box,
-    part_divider=part_divider,
-    space=space_pattern,
-)
+        street_number=street_number,
+        street_name=street_name,
+        street_type=street_type,
+        post_direction=post_direction,
+        floor=floor,
+        building=building,
+        occupancy=occupancy,
+        po_box=po_box,
+        part_divider=part_divider,
+        space=space_pattern,
+    )
+
 
 # region1 is actually a "state"
 region1 = r"""
@@ -391,21 +400,23 @@ postal_code = r"""
 
 country = r"""
         (?P<country>
-            (?:[Tt][Hh][Ee]\ *)?[Uu][Nn][Ii][Tt][Ee][Dd]\ *[Kk][Ii][Nn][Gg][Dd][Oo][Mm]\ *[Oo][Ff]\ *(?:[Gg][Rr][Ee][Aa][Tt]\ *)?[Bb][Rr][Ii][Tt][Aa][Ii][Nn](?:\ *[Aa][Nn][Dd]\ *[Nn][Oo][Rr][Tt][Hh][Ee][Rr][Nn]\ *[Ii][Rr][Ee][Ll][Aa][Nn][Dd])?|
-            (?:[Gg][Rr][Ee][Aa][Tt]\ *)?[Bb][Rr][Ii][Tt][Aa][Ii][Nn](?:\ *[Aa][Nn][Dd]\ *[Nn][Oo][Rr][Tt][Hh][Ee][Rr][Nn]\ *[Ii][Rr][Ee][Ll][Aa][Nn][Dd])?|
-            (?:[Tt][Hh][Ee]\ *)?[Uu][Nn][Ii][Tt][Ee][Dd]\ *[Kk][Ii][Nn][Gg][Dd][Oo][Mm]|
-            (?:[Nn][Oo][Rr][Tt][Hh][Ee][Rr][Nn]\ *)?[Ii][Rr][Ee][Ll][Aa][Nn][Dd]|
-            [Ee][Nn][Gg][Ll][Aa][Nn][Dd]|
-            [Ss][Cc][Oo][Tt][Ll][Aa][Nn][Dd]|
-            [Ww][Aa][Ll][Ee][Ss]|
-            [Cc][Yy][Mm][Rr][Uu]|
-            [Gg][Bb]|
-            [Uu][Kk]|  
+            (?:(?ai:the)\ *)?(?ai:united)\ *(?ai:kingdom)\ *(?ai:of)\ *(?:(?ai:great)\ *)?(?ai:britain)(?:\ *(?ai:and)\ *(?ai:northern)\ *(?ai:ireland))?|
+            (?:(?ai:great)\ *)?(?ai:britain)(?:\ *(?ai:and)\ *(?ai:northern)\ *(?ai:ireland))?|
+            (?:(?ai:the)\ *)?(?ai:united)\ *(?ai:kingdom)|
+            (?:(?ai:northern)\ *)?(?ai:ireland)|
+            (?ai:england)|
+            (?ai:scotland)|
+            (?ai:wales)|
+            (?ai:cymru)|
+            (?ai:gb)|
+            (?ai:uk)|  
             [Nn]\.?\ *[Ii]\.?
         )  # end country
 """
 
-full_address = r"""
+
+def make_full_address() -> str:
+    return r"""
     (?P<full_address>
         {full_street} 
         (?: {part_divider} {city} )?
@@ -414,10 +425,43 @@ full_address = r"""
         (?: {part_divider} {country} )?
     )  # end full_address
 """.format(
-    full_street=full_street,
-    part_divider=part_divider,
-    city=city,
-    region1=region1,
-    country=country,
-    postal_code=postal_code,
-)
+        full_street=__getattr__("full_street"),
+        part_divider=part_divider,
+        city=city,
+        region1=region1,
+        country=country,
+        postal_code=postal_code,
+    )
+
+
+def make_address_prefilter() -> str:
+    """Cheap test that must pass for full_address to match anywhere in a text:
+    the (mandatory) postal code. Meant for `match`, the lookahead scans
+    the whole text.
+    """
+    return r"""
+        \A
+        (?=[\s\S]*?{postal_code})
+        """.format(
+        postal_code=postal_code,
+    )
+
+
+def make_address_anchor() -> str:
+    """Text every full_address match contains: a postal code.
+    The anchored search strategy runs full_address only on the text
+    around these.
+    """
+    return postal_code
+
+
+_LAZY_RULES = {
+    "full_street": make_full_street,
+    "full_address": make_full_address,
+    "address_prefilter": make_address_prefilter,
+    "address_anchor": make_address_anchor,
+}
+
+
+def __getattr__(name: str) -> str:
+    return utils.build_lazy_rule(globals(), name, _LAZY_RULES)
@@ -8,73 +8,80 @@
     detecting US addresses.
 
     The module is expected to always contain 'full_address' variable containing
-    all address parsing definitions.
+    all address parsing definitions. 'full_street' and 'full_address' are
+    built on first access.
 
     :copyright: (c) 2015 by Vladimir Goncharov.
     :license: MIT, see LICENSE for more details.
 """
 
-import string
 from typing import List
 from typing import Optional
 
+from .. import utils
 
-def str_list_to_upper_lower_regex(str_list: List[str]) -> str:
-    regex = "|".join(set(str_list)).lower()
-    for letter in string.ascii_lowercase:
-        regex = regex.replace(
-            letter, "[{upper}{lower}]".format(upper=letter.upper(), lower=letter)
-        )
 
-    return regex
+def str_list_to_upper_lower_regex(str_list: List[str]) -> str:
+    return utils.str_list_to_trie_regex(str_list)
 
 
 space_div = r"(?:[\,\ ]{1,2}|$)"
 
 
 """Numerals from one to nine
-Note: here and below we use syntax like '[Oo][Nn][Ee]'
-instead of '(one)(?i)' to match 'One' or 'oNe' because
-Python Regexps don't seem to support turning On/Off
-case modes for subcapturing groups.
+Note: here and below we use scoped flags like '(?ai:one)'
+to match 'One' or 'oNe' because the global '(?i)' flag
+would make the whole expression case insensitive. The 'a' flag
+keeps case folding to ASCII letters, so e.g. the long s 'ſ' doesn't
+match 's'.
 """
-zero_to_nine = r"""(?:
-    [Zz][Ee][Rr][Oo]\ |[Oo][Nn][Ee]\ |[Tt][Ww][Oo]\ |
-    [Tt][Hh][Rr][Ee][Ee]\ |[Ff][Oo][Uu][Rr]\ |
-    [Ff][Ii][Vv][Ee]\ |[Ss][Ii][Xx]\ |
-    [Ss][Ee][Vv][Ee][Nn]\ |[Ee][Ii][Gg][Hh][Tt]\ |
-    [Nn][Ii][Nn][Ee]\ |[Tt][Ee][Nn]\ |
-    [Ee][Ll][Ee][Vv][Ee][Nn]\ |
-    [Tt][Ww][Ee][Ll][Vv][Ee]\ |
-    [Tt][Hh][Ii][Rr][Tt][Ee][Ee][Nn]\ |
-    [Ff][Oo][Uu][Rr][Tt][Ee][Ee][Nn]\ |
-    [Ff][Ii][Ff][Tt][Ee][Ee][Nn]\ |
-    [Ss][Ii][Xx][Tt][Ee][Ee][Nn]\ |
-    [Ss][Ee][Vv][Ee][Nn][Tt][Ee][Ee][Nn]\ |
-    [Ee][Ii][Gg][Hh][Tt][Ee][Ee][Nn]\ |
-    [Nn][Ii][Nn][Ee][Tt][Ee][Ee][Nn]\ 
-    )"""
+zero_to_nine_list = [
+    r"Zero\ ",
+    r"One\ ",
+    r"Two\ ",
+    r"Three\ ",
+    r"Four\ ",
+    r"Five\ ",
+    r"Six\ ",
+    r"Seven\ ",
+    r"Eight\ ",
+    r"Nine\ ",
+    r"Ten\ ",
+    r"Eleven\ ",
+    r"Twelve\ ",
+    r"Thirteen\ ",
+    r"Fourteen\ ",
+    r"Fifteen\ ",
+    r"Sixteen\ ",
+    r"Seventeen\ ",
+    r"Eighteen\ ",
+    r"Nineteen\ ",
+]
+zero_to_nine = str_list_to_upper_lower_regex(zero_to_nine_list)
 
 # Numerals - 10, 20, 30 ... 90
-ten_to_ninety = r"""(?:
-    [Tt][Ee][Nn]\ |[Tt][Ww][Ee][Nn][Tt][Yy]\ |
-    [Tt][Hh][Ii][Rr][Tt][Yy]\ |
-    [Ff][Oo][Rr][Tt][Yy]\ |
-    [Ff][Oo][Uu][Rr][Tt][Yy]\ |
-    [Ff][Ii][Ff][Tt][Yy]\ |[Ss][Ii][Xx][Tt][Yy]\ |
-    [Ss][Ee][Vv][Ee][Nn][Tt][Yy]\ |
-    [Ee][Ii][Gg][Hh][Tt][Yy]\ |
-    [Nn][Ii][Nn][Ee][Tt][Yy]\ 
-    )"""
+ten_to_ninety_list = [
+    r"Ten\ ",
+    r"Twenty\ ",
+    r"Thirty\ ",
+    r"Forty\ ",
+    r"Fourty\ ",
+    r"Fifty\ ",
+    r"Sixty\ ",
+    r"Seventy\ ",
+    r"Eighty\ ",
+    r"Ninety\ ",
+]
+ten_to_ninety = str_list_to_upper_lower_regex(ten_to_ninety_list)
 
 # One hundred
 hundred = r"""(?:
-    [Hh][Uu][Nn][Dd][Rr][Ee][Dd]\ 
+    (?ai:hundred)\ 
     )"""
 
 # One thousand
 thousand = r"""(?:
-    [Tt][Hh][Oo][Uu][Ss][Aa][Nn][Dd]\ 
+    (?ai:thousand)\ 
     )"""
 
 """
@@ -89,7 +96,7 @@ Street number can be written 2 ways:
 """
 street_number = r"""(?P<street_number>
                         \b(?:
-                            [Aa][Nn][Dd]\ 
+                            (?ai:and)\ 
                             |
                             {thousand}
                             |
@@ -199,12 +206,12 @@ In example below:
 street_name_multi_word_re = r"""
             (?:
                 \b[a-zA-Z0-9\ \.\-\'\’]{3,41}|\b[A-Z][A-Za-z]?(?=\ [A-Z])
-            )(?<![Pp][Hh][Oo][Nn][Ee])
+            )(?<!(?ai:phone))
 """
 
 # This pattern should be quite conservative because it will be followed by
 # optional matchers - we want to avoid matching too much with this.
-street_name_one_word_re = r"(?:(?:[Oo][Ff]\ (?:[Tt][Hh][Ee]\ )?)?[A-Za-z]{,15})"
+street_name_one_word_re = r"(?:(?:(?ai:of)\ (?:(?ai:the)\ )?)?[A-Za-z]{,15})"
 
 
 interstate_specs = [
@@ -216,7 +223,7 @@ interstate_street_type = r"""
             (?:
                 [Ii]\-\ ?\d{{1,4}}
                 |
-                [Ii][Nn][Tt][Ee][Rr][Ss][Tt][Aa][Tt][Ee]\ *\d{{1,4}}
+                (?ai:interstate)\ *\d{{1,4}}
             )
             (?:
                 {space_div}{optional_interstate_specs}
@@ -226,27 +233,27 @@ interstate_street_type = r"""
     optional_interstate_specs=str_list_to_upper_lower_regex(interstate_specs),
 )
 
-highway_re = r"""(?:[Hh][Ii][Gg][Hh][Ww][Aa][Yy]\ +\d{1,4})"""
+highway_re = r"""(?:(?ai:highway)\ +\d{1,4})"""
 
 post_direction_re = r"""
                 (?:
                     (?:
-                        [Nn][Oo][Rr][Tt][Hh]|
-                        [Ss][Oo][Uu][Tt][Hh]|
-                        [Ee][Aa][Ss][Tt]|
-                        [Ww][Ee][Ss][Tt]
+                        (?ai:north)|
+                        (?ai:south)|
+                        (?ai:east)|
+                        (?ai:west)
                     ){1,2}
                     |
-                    \b(?:[Nn][Ww]|[Nn][Ee]|[Ss][Ww]|[Ss][Ee])\b
+                    \b(?:(?ai:nw)|(?ai:ne)|(?ai:sw)|(?ai:se))\b
                     |
-                    \b(?:[Nn]\.[Ww]\.|[Nn]\.[Ee]\.|[Ss]\.[Ww]\.|[Ss]\.[Ee]\.)
+                    \b(?:(?ai:n\.w)\.|(?ai:n\.e)\.|(?ai:s\.w)\.|(?ai:s\.e)\.)
                     |
                     \b(?:[Nn]|[Ss]|[Ee]|[Ww])\b\.?
                 )
                 """
 
 numbered_avenue_re = r"""
-                (?:{post_direction_re}\ [Aa][Vv][Ee](?:\.|[Nn][Uu][Ee])?\ \d{{1,2}})
+                (?:{post_direction_re}\ (?ai:ave)(?:\.|(?ai:nue))?\ \d{{1,2}})
 """.format(
     post_direction_re=post_direction_re
 )
@@ -260,20 +267,18 @@ single_street_name_list = [
     r"Route",
 ]
 
-numbered_road_re = r"""[Ss][Tt][Aa][Tt][Ee]\ [Rr][Oo][Aa][Dd]\ \d{1,4}(?!\d)"""
+numbered_road_re = r"""(?ai:state\ road)\ \d{1,4}(?!\d)"""
 
-numbered_route_re = r"""(?:[Uu][Ss]\ )?[Rr][Oo][Uu][Tt][Ee]\ \#?\d{1,4}(?!\d)"""
+numbered_route_re = r"""(?:(?ai:us)\ )?(?ai:route)\ \#?\d{1,4}(?!\d)"""
 
-numbered_alternate = (
-    r"""(?:[Aa][Ll][Tt]|[Aa][Ll][Tt][Ee][Rr][Nn][Aa][Tt][Ee])\ \d{1,4}(?!\d)"""
-)
+numbered_alternate = r"""(?:(?ai:alt)|(?ai:alternate))\ \d{1,4}(?!\d)"""
 
 # Some states name their state-maintained highways by the state abbreviation
 # and the number.
 numbered_state_highway = r"""
     (?:{states}\ \d{{1,4}}(?!\d))
     |
-    (?:[Ss][Tt][Aa][Tt][Ee]\s[Hh][Ww][Yy]\s\d{{1,4}}(?!\d))
+    (?:(?ai:state)\s(?ai:hwy)\s\d{{1,4}}(?!\d))
 """.format(
     states=state_highway_abbrvs_regex()
 )
@@ -288,7 +293,7 @@ def numbered_or_typeless_street_name(idx: str) -> str:
             (?:
                 {single_street_name_regex}
                 |
-                [Aa][Tt]\ {interstate_street_type}
+                (?ai:at)\ {interstate_street_type}
                 |
                 {highway_re}
                 |
@@ -908,10 +913,8 @@ def street_type_list_to_regex(street_type_list: list[str]) -> str:
     street_types = str_list_to_upper_lower_regex(street_type_list)
 
     # Use \b to check that there are word boundaries before and after the street type
-    # Optionally match zero to two of " ", ",", or "." after the street name
-    street_types = street_types.replace("|", r"\b|\b")
-    street_types = r"\b" + r"(?:" + street_types + r")" + r"\b\.?"
-    return street_types
+    # Optionally match a "." after the street type
+    return r"\b" + street_types + r"\b\.?"
 
 
 street_types_re = street_type_list_to_regex(street_type_list)
@@ -926,7 +929,7 @@ def street_type_extended(idx: str) -> str:
             (?:
                 {street_type}
                 (?P<route_id_{idx}>
-                    {space_div}\(?[Rr][Oo][Uu][Tt][Ee]\ [A-Za-z0-9]+(?:\ ?\))?
+                    {space_div}\(?(?ai:route)\ [A-Za-z0-9]+(?:\ ?\))?
                 )?
             )
     """.format(
@@ -956,8 +959,8 @@ typed_street_name = r"""
 
 floor_indic = r"""
             (?:
-                (?:[Ff][Ll][Oo][Oo][Rr]|[Ff][Ll][Rr]?\.?)
-                (?:\ (?:[Hh][Oo][Rr][Ii][Zz][Oo][Nn][Tt][Aa][Ll]|[Hh][Oo][Rr][Ii][Zz]))?
+                (?ai:floor|flr?\.?)
+                (?:\ (?:(?ai:horizontal)|(?ai:horiz)))?
             )
         """
 
@@ -975,7 +978,7 @@ floor = r"""
     floor_indic=floor_indic
 )
 
-tower = r"(?:{re_post_direction}\ [Tt][Oo][Ww][Ee][Rr])".format(
+tower = r"(?:{re_post_direction}\ (?ai:tower))".format(
     re_post_direction=post_direction_re
 )
 
@@ -983,16 +986,16 @@ building = r"""
             (?P<building_id>
                 (?:
                     (?:
-                        (?:[Bb][Uu][Ii][Ll][Dd][Ii][Nn][Gg])\.?
+                        (?ai:building)\.?
                         |
-                        (?:[Bb][Ll][Dd][Gg])\.?
+                        (?ai:bldg)\.?
                         |
-                        (?:[Bb][Ll][Vv])\.?
+                        (?ai:blv)\.?
                     )
                     \ 
                     (?:
                         (?:
-                            [Aa][Nn][Dd]\ 
+                            (?ai:and)\ 
                             |
                             {thousand}
                             |
@@ -1028,35 +1031,35 @@ occupancy = r"""
                     (?:
                         (?:
                             # Suite
-                            [Ss][Uu][Ii][Tt][Ee]
+                            (?ai:suite)
                             |
                             # Apartment
-                            (?:[Aa][Pp][Tt]\#[\ \.]+)?(?:[Aa][Pp][Tt]?|[Aa][Pp][Aa][Rr][Tt][Mm][Ee][Nn][Tt])
+                            (?:(?ai:apt)\#[\ \.]+)?(?ai:apt?|apartment)
                             |
                             # Room
-                            [Rr][Oo][Oo][Mm]|[Rr][Mm]
+                            (?ai:room)|(?ai:rm)
                             |
                             # Unit
-                            [Uu][Nn][Ii][Tt]
+                            (?ai:unit)
                             |
                             # Place
-                            [Pp][Ll][Aa][Cc][Ee]|[Pp][Ll]
+                            (?ai:place)|(?ai:pl)
                             |
                             # Bay
-                            [Bb][Aa][Yy]
+                            (?ai:bay)
                             |
                             # Site
-                            [Ss][Ii][Tt][Ee]
+                            (?ai:site)
                             |
                             # Space
-                            [Ss][Pp][Cc]|[Ss][Pp][Aa][Cc][Ee]
+                            (?ai:spc)|(?ai:space)
                             |
                             # Lot
-                            [Ll][Oo][Tt]
+                            (?ai:lot)
                         )\b[\ \,\.]*
                         {occupancy_details}? 
                         |
-                        \d{{2,4}}\ [Ss][Tt][Ee](?:\ \*)?
+                        \d{{2,4}}\ (?ai:ste)(?:\ \*)?
                     )
                     |
                     (?:
@@ -1074,7 +1077,7 @@ occupancy = r"""
                         # it needs to be separated to ensure `occupancy_details`
                         # is present because otherwise it would match stuff like
                         # the `ST.` in `ST. LOUIS`
-                        [Ss][Tt][Ee]?\b[\ \,\.]+{occupancy_details}
+                        (?ai:ste?)\b[\ \,\.]+{occupancy_details}
                     )
                     |
                     (?:
@@ -1098,7 +1101,7 @@ po_marker = r"""
             (?:
                 [Pp]\.?\ ?[Oo]\.?\ ?
                 |
-                [Pp][Oo][Ss][Tt]\ [Oo][Ff][Ff][Ii][Cc][Ee]\ ?
+                (?ai:post\ office)\ ?
             )
             """
 
@@ -1107,16 +1110,16 @@ po_box = r"""
             (?:
                 (?:
                     (?:
-                        [Bb][Oo][Xx]
+                        (?ai:box)
                         |
-                        [Pp][Mm][Bb]
+                        (?ai:pmb)
                         |
                         {po_marker}
                     )
                     \ \#?\ ?A?\d+
                 )
                 |
-                (?:[Dd][Rr][Aa][Ww][Ee][Rr]\ +[A-Z]\b)
+                (?:(?ai:drawer)\ +[A-Z]\b)
             )
         """.format(
     po_marker=po_marker
@@ -1124,7 +1127,7 @@ po_box = r"""
 
 phone_number = r"""
             (?:
-                \*?(?:[Pp][Hh]\ )?
+                \*?(?:(?ai:ph)\ )?
                 (?P<phone_number>
                     \(?\d{3}\)?\-?\ ?\d{3}\-?\ ?\-?\d{4}
                 )
@@ -1133,7 +1136,9 @@ phone_number = r"""
 
 part_div = r"(?:[\,\s]{1,3}|\ \-\ |$)"  # allows for line breaks
 
-full_street = r"""
+
+def make_full_street() -> str:
+    return r"""
     (?:
         (?P<full_street>
             (?:
@@ -1173,21 +1178,87 @@ full_street = r"""
             (?P<po_box_c>{po_box})
         )
     )""".format(
-    space_div=space_div,
-    part_div=part_div,
-    street_number=street_number,
-    typed_street_name=typed_street_name,
-    numbered_or_typeless_street_name_a=numbered_or_typeless_street_name("a"),
-    numbered_or_typeless_street_name_b=numbered_or_typeless_street_name("b"),
-    street_type=street_type_extended("c"),
-    post_direction=post_direction,
-    post_direction_re=post_direction_re,
-    floor=floor,
-    building=building,
-    occupancy=occupancy,
-    mail_stop=mail_stop,
-    po_box=po_box,
-)
+        space_div=space_div,
+        part_div=part_div,
+        street_number=street_number,
+        typed_street_name=typed_street_name,
+        numbered_or_typeless_street_name_a=numbered_or_typeless_street_name("a"),
+        numbered_or_typeless_street_name_b=numbered_or_typeless_street_name("b"),
+        street_type=street_type_extended("c"),
+        post_direction=post_direction,
+        post_direction_re=post_direction_re,
+        floor=floor,
+        building=building,
+        occupancy=occupancy,
+        mail_stop=mail_stop,
+        po_box=po_box,
+    )
+
+
+STATE_NAMES = [
+    "Alabama",
+    "Alaska",
+    "Arizona",
+    "Arkansas",
+    "California",
+    "Colorado",
+    "Connecticut",
+    "Delaware",
+    r"District\ of\ Columbia",
+    "Florida",
+    "Georgia",
+    "Hawaii",
+    "Idaho",
+    "Illinois",
+    "Indiana",
+    "Iowa",
+    "Kansas",
+    "Kentucky",
+    "Louisiana",
+    "Maine",
+    "Maryland",
+    "Massachusetts",
+    "Michigan",
+    "Minnesota",
+    "Mississippi",
+    "Missouri",
+    "Montana",
+    "Nebraska",
+    "Nevada",
+    r"New\ Hampshire",
+    r"New\ Jersey",
+    r"New\ Mexico",
+    r"New\ York",
+    r"North\ Carolina",
+    r"North\ Dakota",
+    "Ohio",
+    "Oklahoma",
+    "Oregon",
+    "Pennsylvania",
+    r"Rhode\ Island",
+    r"South\ Carolina",
+    r"South\ Dakota",
+    "Tennessee",
+    "Texas",
+    "Utah",
+    "Vermont",
+    "Virginia",
+    "Washington",
+    r"West\ Virginia",
+    "Wisconsin",
+    "Wyoming",
+]
+
+# unincorporated & commonwealth territories
+TERRITORY_NAMES = [
+    r"American\ Samoa",
+    "Guam",
+    r"Northern\ Mariana\ Islands",
+    r"Puerto\ Rico",
+    r"Virgin\ Islands",
+]
+
+state_names_re = str_list_to_upper_lower_regex(STATE_NAMES + TERRITORY_NAMES)
 
 
 # region1 is actually a "state"
@@ -1197,65 +1268,7 @@ def make_region1(idx: Optional[str] = None):
         (?P<region1{maybe_idx}>
             (?:
                 # states full
-                [Aa][Ll][Aa][Bb][Aa][Mm][Aa]|
-                [Aa][Ll][Aa][Ss][Kk][Aa]|
-                [Aa][Rr][Ii][Zz][Oo][Nn][Aa]|
-                [Aa][Rr][Kk][Aa][Nn][Ss][Aa][Ss]|
-                [Cc][Aa][Ll][Ii][Ff][Oo][Rr][Nn][Ii][Aa]|
-                [Cc][Oo][Ll][Oo][Rr][Aa][Dd][Oo]|
-                [Cc][Oo][Nn][Nn][Ee][Cc][Tt][Ii][Cc][Uu][Tt]|
-                [Dd][Ee][Ll][Aa][Ww][Aa][Rr][Ee]|
-                [Dd][Ii][Ss][Tt][Rr][Ii][Cc][Tt]\ [Oo][Ff]\ 
-                [Cc][Oo][Ll][Uu][Mm][Bb][Ii][Aa]|
-                [Ff][Ll][Oo][Rr][Ii][Dd][Aa]|
-                [Gg][Ee][Oo][Rr][Gg][Ii][Aa]|
-                [Hh][Aa][Ww][Aa][Ii][Ii]|
-                [Ii][Dd][Aa][Hh][Oo]|
-                [Ii][Ll][Ll][Ii][Nn][Oo][Ii][Ss]|
-                [Ii][Nn][Dd][Ii][Aa][Nn][Aa]|
-                [Ii][Oo][Ww][Aa]|
-                [Kk][Aa][Nn][Ss][Aa][Ss]|
-                [Kk][Ee][Nn][Tt][Uu][Cc][Kk][Yy]|
-                [Ll][Oo][Uu][Ii][Ss][Ii][Aa][Nn][Aa]|
-                [Mm][Aa][Ii][Nn][Ee]|
-                [Mm][Aa][Rr][Yy][Ll][Aa][Nn][Dd]|
-                [Mm][Aa][Ss][Ss][Aa][Cc][Hh][Uu][Ss][Ee][Tt][Tt][Ss]|
-                [Mm][Ii][Cc][Hh][Ii][Gg][Aa][Nn]|
-                [Mm][Ii][Nn][Nn][Ee][Ss][Oo][Tt][Aa]|
-                [Mm][Ii][Ss][Ss][Ii][Ss][Ss][Ii][Pp][Pp][Ii]|
-                [Mm][Ii][Ss][Ss][Oo][Uu][Rr][Ii]|
-                [Mm][Oo][Nn][Tt][Aa][Nn][Aa]|
-                [Nn][Ee][Bb][Rr][Aa][Ss][Kk][Aa]|
-                [Nn][Ee][Vv][Aa][Dd][Aa]|
-                [Nn][Ee][Ww]\ [Hh][Aa][Mm][Pp][Ss][Hh][Ii][Rr][Ee]|
-                [Nn][Ee][Ww]\ [Jj][Ee][Rr][Ss][Ee][Yy]|
-                [Nn][Ee][Ww]\ [Mm][Ee][Xx][Ii][Cc][Oo]|
-                [Nn][Ee][Ww]\ [Yy][Oo][Rr][Kk]|
-                [Nn][Oo][Rr][Tt][Hh]\ [Cc][Aa][Rr][Oo][Ll][Ii][Nn][Aa]|
-                [Nn][Oo][Rr][Tt][Hh]\ [Dd][Aa][Kk][Oo][Tt][Aa]|
-                [Oo][Hh][Ii][Oo]|
-                [Oo][Kk][Ll][Aa][Hh][Oo][Mm][Aa]|
-                [Oo][Rr][Ee][Gg][Oo][Nn]|
-                [Pp][Ee][Nn][Nn][Ss][Yy][Ll][Vv][Aa][Nn][Ii][Aa]|
-                [Rr][Hh][Oo][Dd][Ee]\ [Ii][Ss][Ll][Aa][Nn][Dd]|
-                [Ss][Oo][Uu][Tt][Hh]\ [Cc][Aa][Rr][Oo][Ll][Ii][Nn][Aa]|
-                [Ss][Oo][Uu][Tt][Hh]\ [Dd][Aa][Kk][Oo][Tt][Aa]|
-                [Tt][Ee][Nn][Nn][Ee][Ss][Ss][Ee][Ee]|
-                [Tt][Ee][Xx][Aa][Ss]|
-                [Uu][Tt][Aa][Hh]|
-                [Vv][Ee][Rr][Mm][Oo][Nn][Tt]|
-                [Vv][Ii][Rr][Gg][Ii][Nn][Ii][Aa]|
-                [Ww][Aa][Ss][Hh][Ii][Nn][Gg][Tt][Oo][Nn]|
-                [Ww][Ee][Ss][Tt]\ [Vv][Ii][Rr][Gg][Ii][Nn][Ii][Aa]|
-                [Ww][Ii][Ss][Cc][Oo][Nn][Ss][Ii][Nn]|
-                [Ww][Yy][Oo][Mm][Ii][Nn][Gg]|
-                # unincorporated & commonwealth territories
-                [Aa][Mm][Ee][Rr][Ii][Cc][Aa][Nn]\ [Ss][Aa][Mm][Oo][Aa]
-                |[Gg][Uu][Aa][Mm]|
-                [Nn][Oo][Rr][Tt][Hh][Ee][Rr][Nn]\ [Mm][Aa][Rr][Ii][Aa][Nn][Aa]\ 
-                [Ii][Ss][Ll][Aa][Nn][Dd][Ss]|
-                [Pp][Uu][Ee][Rr][Tt][Oo]\ [Rr][Ii][Cc][Oo]|
-                [Vv][Ii][Rr][Gg][Ii][Nn]\ [Ii][Ss][Ll][Aa][Nn][Dd][Ss]
+                {state_names}
             )
             |
             (?:
@@ -1264,7 +1277,9 @@ def make_region1(idx: Optional[str] = None):
             )
         )
         """.format(
-        state_abbrvs=states_abbrvs_regex(), maybe_idx=maybe_idx
+        state_names=state_names_re,
+        state_abbrvs=states_abbrvs_regex(),
+        maybe_idx=maybe_idx,
     )
 
 
@@ -1293,7 +1308,7 @@ def make_country(idx: Optional[str] = None) -> str:
     return rf"""
             (?P<country{maybe_idx}>
                 [Uu]\.?[Ss]\.?(?:[Aa]\.?)?|
-                [Uu][Nn][Ii][Tt][Ee][Dd]\ [Ss][Tt][Aa][Tt][Ee][Ss](?:\ [Oo][Ff]\ [Aa][Mm][Ee][Rr][Ii][Cc][Aa])?
+                (?ai:united\ states)(?:\ (?ai:of\ america))?
             )
             """
 
@@ -1314,15 +1329,12 @@ def make_region1_postal_code(
         """
 
 
-region1_postal_code = make_region1_postal_code()
-
-
 def make_full_address(
     *,
-    full_street: str = full_street,
+    full_street: Optional[str] = None,
     part_div: str = part_div,
     city: str = city,
-    region1_postal_code: str = region1_postal_code,
+    region1_postal_code: Optional[str] = None,
     country: Optional[str] = None,
     phone_number: str = phone_number,
 ) -> str:
@@ -1335,13 +1347,57 @@ def make_full_address(
                     (?:{part_div} {country})?
                 )
                 """.format(
-        full_street=full_street,
+        full_street=full_street or __getattr__("full_street"),
         part_div=part_div,
         city=city,
-        region1_postal_code=region1_postal_code,
+        region1_postal_code=region1_postal_code or __getattr__("region1_postal_code"),
         country=country or make_country("a"),
         phone_number=phone_number,
     )
 
 
-full_address = make_full_address()
+def make_address_prefilter() -> str:
+    """Cheap test that must pass for full_address to match anywhere in a text:
+    a state or postal code and something a street can start with.
+    Both parts are (alternations of) sub-rules of full_address,
+    so a text failing this rule never contains an address.
+    Meant for `match`, the lookaheads scan the whole text.
+    """
+    return r"""
+        \A
+        (?=[\s\S]*?(?:{postal_code_re}|{part_div}{region1}))
+        (?=[\s\S]*?(?:\d|{street_number}|{single_street_names}|(?ai:drawer)))
+        """.format(
+        postal_code_re=postal_code_re,
+        part_div=part_div,
+        region1=make_region1(),
+        street_number=street_number,
+        single_street_names=str_list_to_upper_lower_regex(single_street_name_list),
+    )
+
+
+def make_address_anchor() -> str:
+    """Text every full_address match contains: a postal code or a state
+    (see make_region1_postal_code). The anchored search strategy runs
+    full_address only on the text around these.
+    """
+    return r"""
+        {postal_code_re}|{part_div}{region1}
+        """.format(
+        postal_code_re=postal_code_re,
+        part_div=part_div,
+        region1=make_region1(),
+    )
+
+
+_LAZY_RULES = {
+    "full_street": make_full_street,
+    "region1_postal_code": make_region1_postal_code,
+    "full_address": make_full_address,
+    "address_prefilter": make_address_prefilter,
+    "address_anchor": make_address_anchor,
+}
+
+
+def __getattr__(name: str) -> str:
+    return utils.build_lazy_rule(globals(), name, _LAZY_RULES)
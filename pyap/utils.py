@@ -11,10 +11,17 @@
 """
 
 import re
-from typing import Any, List, Union
+import threading
+from typing import Any, Callable, Dict, List, Tuple, Union
 
 DEFAULT_FLAGS = re.VERBOSE | re.UNICODE
 
+# escaped character, character class or a single character
+_WORD_TOKEN = re.compile(r"\\.|\[[^\]]*\]|.", re.DOTALL)
+_REGEX_OPERATORS = re.compile(r"(?<!\\)[()?*+{]")
+# guards the lazy rule builders of all rule modules
+_LAZY_RULES_LOCK = threading.RLock()
+
 
 def match(
     regex: Union[str, re.Pattern[str]], string: str, flags: re.RegexFlag = DEFAULT_FLAGS
@@ -40,3 +47,115 @@ def finditer(
 def unicode_str(string: str) -> str:
     """Return Unicode string"""
     return string
+
+
+def build_lazy_rule(
+    namespace: Dict[str, Any], name: str, makers: Dict[str, Callable[[], str]]
+) -> str:
+    """Module-level __getattr__ helper for rule modules:
+    builds rule `name` on first access and stores it in the module
+    namespace, so the following lookups never get here.
+    """
+    if name in namespace:
+        return namespace[name]
+    try:
+        make = makers[name]
+    except KeyError:
+        raise AttributeError(
+            "module {module!r} has no attribute {name!r}".format(
+                module=namespace["__name__"], name=name
+            )
+        )
+    # reentrant: building full_address builds full_street
+    with _LAZY_RULES_LOCK:
+        if name not in namespace:
+            namespace[name] = make()
+    return namespace[name]
+
+
+def _fold(char: str) -> str:
+    # (?ai:...) folds ASCII letters only, others are matched by a class
+    lower, upper = char.lower(), char.upper()
+    if lower.isascii() or lower == upper or len(upper) != 1:
+        return lower
+    return "[" + lower + upper + "]"
+
+
+def _tokenize(word: str) -> List[str]:
+    # escapes and classes are kept verbatim, '\\B' is not '\\b'
+    return [
+        token if len(token) > 1 else _fold(token) for token in _WORD_TOKEN.findall(word)
+    ]
+
+
+def _raw_to_regex(word: str) -> str:
+    return "".join(_tokenize(word))
+
+
+def _trie_to_regex(trie: Dict[str, Any]) -> str:
+    is_word = "" in trie
+    branches = [
+        token + _trie_to_regex(child) for token, child in sorted(trie.items()) if token
+    ]
+    if not branches:
+        return ""
+    if len(branches) == 1 and not is_word:
+        return branches[0]
+    regex = "(?:" + "|".join(branches) + ")"
+    # a longer word is always tried before its prefix
+    return regex + "?" if is_word else regex
+
+
+def str_list_to_trie_regex(str_list: List[str], factor: bool = True) -> str:
+    """Converts a list of words into a case insensitive alternation
+    with common prefixes factored out:
+
+        ['Ave', 'Avenue', 'Avn'] -> '(?ai:av(?:e(?:nue)?|n))'
+
+    which lets the regex engine reject a position after a single character
+    test instead of trying every word in turn. Words are regex fragments:
+    escapes ('Cut\\ Off') and character classes are kept as single tokens,
+    while words containing groups or quantifiers are appended to the
+    alternation as they are. Like with a 'longest first' alternation a word
+    is always tried before its prefixes. The result is deterministic and
+    is a single scoped '(?ai:...)' group, so it can be embedded in case
+    sensitive rules; non-ASCII letters become classes like '[éÉ]' as
+    the case folding is ASCII only. `factor=False` gives the flat 'longest first'
+    alternation of the same words.
+    """
+    words: List[str] = []
+    for word in str_list:
+        words.extend(word.split("|") if "(" not in word else [word])
+
+    def longest_first(w: str) -> Tuple[int, str]:
+        return (-len(w), w)
+
+    unique = sorted(set(words), key=longest_first)
+    raw = [w for w in unique if not factor or _REGEX_OPERATORS.search(w)]
+    trie: Dict[str, Any] = {}
+    for word in unique:
+        if word in raw:
+            continue
+        node = trie
+        for token in _tokenize(word):
+            node = node.setdefault(token, {})
+        node[""] = {}
+
+    branches = [_trie_to_regex(trie)] if trie else []
+    return "(?ai:" + "|".join(branches + [_raw_to_regex(w) for w in raw]) + ")"
+
+
+def str_list_to_regex(str_list: List[str]) -> str:
+    """Converts a list of words into a case insensitive alternation
+    which keeps the order of the list:
+
+        ['Cour', 'Court'] -> '(?ai:cour|court)'
+
+    for word lists where the first matching word wins, even if it is the
+    prefix of a longer one. Words are handled like in str_list_to_trie_regex.
+    """
+    words: List[str] = []
+    for word in str_list:
+        words.extend(word.split("|") if "(" not in word else [word])
+    unique = list(dict.fromkeys(words))
+    return "(?ai:" + "|".join(_raw_to_regex(w) for w in unique) + ")"
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+
+""" Tests for asyncio parse functions """
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from pyap import exceptions, parse
+from pyap import aparse, aparse_many
+
+from .test_parser import BATCH
+
+
+def test_aparse():
+    expected = [parse(text, country="US") for text in BATCH]
+    assert asyncio.run(aparse(BATCH[0], "US")) == expected[0]
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = asyncio.run(
+            aparse_many(BATCH, "US", executor=executor, concurrency=2, timeout=60)
+        )
+    assert results == expected
+    with pytest.raises(exceptions.CountryDetectionMissing):
+        asyncio.run(aparse("", "XX"))  # type: ignore
+    with pytest.raises(ValueError):
+        asyncio.run(aparse_many(BATCH, "US", concurrency=0))
+
+
+def test_aparse_deadline():
+    release = threading.Event()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        # the only worker is busy, parse calls wait in the queue
+        executor.submit(release.wait)
+        try:
+            with pytest.raises(asyncio.TimeoutError):
+                asyncio.run(aparse(BATCH[0], "US", executor=executor, timeout=0.01))
+            results = asyncio.run(
+                aparse_many(
+                    BATCH[:2],
+                    "US",
+                    executor=executor,
+                    timeout=0.01,
+                    return_exceptions=True,
+                )
+            )
+            assert [type(result) for result in results] == [asyncio.TimeoutError] * 2
+        finally:
+            release.set()
@@ -0,0 +1,57 @@
+# pyright: reportPrivateUsage=false
+# -*- coding: utf-8 -*-
+
+""" Tests for batch parsing of many texts """
+
+import pytest
+from pyap import batch, exceptions, parse, parser
+from pyap import iter_parse_many, parse_many
+
+from .test_parser import BATCH
+
+
+def test_parse_batch():
+    ap = parser.AddressParser(country="US")
+    expected = [parse(text, country="US") for text in BATCH]
+    assert ap.parse_batch(BATCH) == expected
+    assert list(ap.iter_parse_batch(iter(BATCH))) == list(enumerate(expected))
+
+
+@pytest.mark.parametrize(
+    "workers,backend", [(None, "process"), (3, "process"), (3, "thread")]
+)
+def test_parse_many(workers, backend):
+    expected = [parse(text, country="US") for text in BATCH]
+    assert parse_many(iter(BATCH), "US", workers=workers, backend=backend) == expected
+    pairs = list(iter_parse_many(BATCH, "US", workers=workers, backend=backend))
+    assert sorted(pairs, key=lambda pair: pair[0]) == list(enumerate(expected))
+
+
+def test_batch_chunks_are_balanced_by_size():
+    texts = ["x" * 1000] * 8 + ["x" * 10] * 100
+    chunks = list(batch._chunks(texts, workers=2))
+    assert [text for _, chunk in chunks for text in chunk] == texts
+    # 4 chunks per worker of about 2000 characters each
+    assert [start for start, _ in chunks] == [0, 2, 4, 6, 8, 35, 62, 89]
+
+    streamed = list(batch._chunks(iter(texts), workers=2))
+    assert streamed == [(0, texts)]
+
+
+def test_parse_many_checks_arguments():
+    with pytest.raises(exceptions.CountryDetectionMissing):
+        parse_many(BATCH, "XX")
+    with pytest.raises(ValueError):
+        parse_many(BATCH, "US", workers=0)
+    with pytest.raises(ValueError):
+        parse_many(BATCH, "US", workers=2, backend="fiber")  # type: ignore
+
+
+def test_parse_many_countries_and_chunk_size():
+    texts = BATCH[:4] + ["Flat 5, 10 Downing Street, London SW1A 2AA"]
+    expected = [parse(t, country="US") + parse(t, country="GB") for t in texts]
+    assert parse_many(texts, ["US", "GB"]) == expected
+    assert parse_many(texts, ("US", "GB"), workers=2, chunk_size=1) == expected
+    assert [len(chunk) for _, chunk in batch._chunks(BATCH, 2, chunk_size=1)] == [
+        1
+    ] * len(BATCH)
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+
+""" Tests for the pyap command line tool """
+
+import csv
+import io
+import json
+import sys
+
+import pytest
+from pyap import address, cli, parse
+
+from .test_parser import BATCH
+
+
+def test_cli_jsonl(tmp_path, capsys):
+    path = tmp_path / "records.jsonl"
+    path.write_text(
+        json.dumps({"id": "a", "body": {"text": BATCH[0]}})
+        + "\n\n"
+        + json.dumps({"id": "b", "body": {"text": BATCH[3]}})
+        + "\n"
+    )
+    assert cli.main([str(path), "--text-field", "body.text", "--id-field", "id"]) == 0
+    rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [(r["source"], r["record"]) for r in rows] == [
+        (str(path), "a"),
+        (str(path), "b"),
+        (str(path), "b"),
+    ]
+    assert [r["full_address"] for r in rows] == [
+        str(a) for a in parse(BATCH[0], "US") + parse(BATCH[3], "US")
+    ]
+
+
+def test_cli_csv_and_workers(tmp_path):
+    path = tmp_path / "records.csv"
+    path.write_text(
+        "text\n" + "".join('"{}"\n'.format(text) for text in BATCH[:8]),
+        encoding="utf-8",
+    )
+    output = tmp_path / "out.csv"
+    rows = []
+    for workers in ("1", "2"):
+        cli.main([str(path), "-t", "csv", "-o", str(output), "-w", workers])
+        with open(output, encoding="utf-8", newline="") as f:
+            rows.append(sorted(csv.reader(f)))
+    assert rows[0] == rows[1]
+    header = ["source", "record", *address.FIELDS]
+    assert header in rows[0]
+    records = [row[1] for row in rows[0] if row != header]
+    assert sorted(records) == ["1", "4", "4", "5", "8", "8"]
+
+
+def test_cli_options(tmp_path, capsys):
+    letter = tmp_path / "letter.txt"
+    letter.write_text(BATCH[0])
+    rows = tmp_path / "rows.csv"
+    rows.write_text('body.text,id\n"{}",7\n'.format(BATCH[0]))
+    # a country before the files doesn't take them as countries
+    args = ["-c", "US", str(letter), str(rows), "--text-field", "body.text"]
+    assert cli.main(args) == 0
+    assert cli.main(["--text-field", "body.text", "--id-field", "id", str(rows)]) == 0
+    out = capsys.readouterr().out.splitlines()
+    addr = parse(BATCH[0], "US")[0]
+    assert [json.loads(line) for line in out] == [
+        {"source": str(letter), "record": 1, **addr.as_dict()},
+        {"source": str(rows), "record": 1, **addr.as_dict()},
+        {"source": str(rows), "record": "7", **addr.as_dict()},
+    ]
+    with pytest.raises(SystemExit):
+        cli.main(["-c", "US,XX", str(letter)])
+
+
+def test_cli_stdin(monkeypatch, capsys):
+    text = BATCH[0] + " Flat 5, 10 Downing Street, London SW1A 2AA"
+    monkeypatch.setattr(sys, "stdin", io.StringIO(text))
+    assert cli.main(["-c", "us,gb", "--progress"]) == 0
+    out, err = capsys.readouterr()
+    rows = [json.loads(line) for line in out.splitlines()]
+    assert [r["country_id"] for r in rows] == ["US", "GB"]
+    assert {(r["source"], r["record"]) for r in rows} == {("-", 1)}
+    assert "1 records, 2 addresses" in err
+
+
+def test_cli_input_errors(tmp_path, capsys):
+    path = tmp_path / "records.jsonl"
+    path.write_text('{"body": "x"}\n')
+    with pytest.raises(SystemExit) as exc:
+        cli.main([str(path)])
+    assert exc.value.code == 1
+    assert "record 1 of {} has no field".format(path) in capsys.readouterr().err
+
+    path.write_text("not json\n")
+    with pytest.raises(SystemExit) as exc:
+        cli.main([str(path)])
+    assert exc.value.code == 1
+    assert "line 1 of {} is not valid JSON".format(path) in capsys.readouterr().err
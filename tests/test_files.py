@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+
+""" Tests for parsing of streams and files """
+
+import io
+
+import pytest
+from pyap import files, parser
+from pyap import parse_file
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 4096])
+def test_iter_parse_matches_parse(chunk_size):
+    addresses = [
+        "225 E. John Carpenter Freeway, Suite 1500 Irving, Texas 75062",
+        "One Broadway, New York, NY",
+        "1111 3rd Street Promenade, Santa Monica, CA 90000",
+    ]
+    text = " ,\t , lorem ipsum — dolor sit amet\n".join(addresses * 5)
+    ap = parser.AddressParser(country="US")
+    expected = [a.as_dict() for a in ap.parse(text)]
+    assert len(expected) == 15
+
+    stream = io.StringIO(text)
+    found = ap.iter_parse(stream, chunk_size=chunk_size, overlap=300)
+    assert [a.as_dict() for a in found] == expected
+
+    chunks = [text[i : i + chunk_size] for i in range(0, len(text), chunk_size)]
+    assert [a.as_dict() for a in ap.iter_parse(chunks)] == expected
+
+
+@pytest.mark.parametrize("encoding", ["utf-8", "utf-8-sig", "utf-16", "latin-1"])
+def test_parse_file(tmp_path, monkeypatch, encoding):
+    monkeypatch.setattr(files, "READ_SIZE", 5)
+    lines = [
+        "Adresse:  é  ,\t 225 E. John Carpenter Freeway, Suite 1500 Irving, TX 75062",
+        "lorem ipsum",
+        "One Broadway, New York, NY \t",
+    ]
+    text = "\n".join(lines * 3)
+    path = tmp_path / "dump.txt"
+    path.write_bytes(text.encode(encoding))
+
+    found = parse_file(path, "US", encoding=encoding, overlap=300)
+    expected = parser.AddressParser(country="US").parse(text)
+    assert [f.address.full_address for f in found] == [a.full_address for a in expected]
+    assert len(found) == 6
+    data = path.read_bytes()
+    decode_as = encoding.replace("-sig", "")
+    for addr, byte_start, byte_end in found:
+        original = text[addr.match_start : addr.match_end]
+        assert original.startswith(("225", "One"))
+        assert data[byte_start:byte_end].decode(decode_as) == original
+
+
+def test_parse_empty_file(tmp_path):
+    path = tmp_path / "empty.txt"
+    path.write_bytes(b"")
+    assert parse_file(path, "US") == []
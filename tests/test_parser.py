@@ -3,8 +3,23 @@
 
 """Test for parser classes"""
 
+import dataclasses
+import io
+import json
+import os
+import pickle
+import re
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
-from pyap import parser, exceptions, address, parse, parse_single_street
+import pyap
+from pyap import parser, exceptions, address, parse, parse_single_street, registry
+from pyap import offsets, utils
+from benchmarks import backtracking
+from pyap import parse_columns, warmup
 
 
 def test_api_parse():
@@ -45,6 +60,52 @@ def test_api_parse_single_street_skips_mixed_case_state_highway_false_positive()
     assert str(addresses[0].full_street) == "8901 North Lander Avenue"
 
 
+BATCH = [
+    "xxx 225 E. John Carpenter Freeway, Suite 1500 Irving, Texas 75062 xxx",
+    "no address here",
+    "",
+    "1111 3rd Street Promenade, Santa Monica, CA 90000 and One Broadway, New York, NY",
+] * 40
+
+
+def test_parser_is_thread_safe():
+    # switch threads as often as possible to surface races
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        ap = parser.AddressParser(country="US")
+        texts = [text + " " * i for i, text in enumerate(BATCH)]
+        expected = [[a.as_dict() for a in ap.parse(text)] for text in texts]
+        barrier = threading.Barrier(8)
+
+        def run(offset: int):
+            barrier.wait()
+            shifted = texts[offset:] + texts[:offset]
+            return [[a.as_dict() for a in ap.parse(text)] for text in shifted]
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(run, range(8)))
+        for offset, result in enumerate(results):
+            assert result == expected[offset:] + expected[:offset]
+    finally:
+        sys.setswitchinterval(interval)
+
+
+def test_parse_tuples_and_columns():
+    ap = parser.AddressParser(country="US")
+    expected = [[a.as_dict() for a in ap.parse(text)] for text in BATCH]
+    rows = [ap.parse_tuples(text) for text in BATCH]
+    as_dicts = [[dict(zip(address.FIELDS, row)) for row in found] for found in rows]
+    assert as_dicts == expected
+
+    columns = parse_columns(iter(BATCH), "US")
+    assert list(columns) == ["text_index", *address.FIELDS]
+    flat = [(i, a) for i, found in enumerate(expected) for a in found]
+    assert columns["text_index"] == [i for i, _ in flat]
+    assert columns["postal_code"] == [a["postal_code"] for _, a in flat]
+    assert parse_columns([], "US") == {f: [] for f in columns}
+
+
 def test_address_class_init():
     addr = address.Address(
         country_id="US",
@@ -65,6 +126,39 @@ def test_address_class_init():
     assert str(addr) == "Street 1b CityVille USA"
 
 
+def test_address_is_slotted():
+    addr = address.Address(
+        match_end=10,
+        match_start=5,
+        country_id="US",
+        full_street="Street 1b ",
+        full_address="Street 1b, CityVille",
+        line1="Street 1b",
+        city=["CityVille, "],  # type: ignore
+    )
+    assert not hasattr(addr, "__dict__")
+    assert (addr.full_street, addr.city) == ("Street 1b", "CityVille")
+    assert addr.region1 is None
+    assert pickle.loads(pickle.dumps(addr)) == addr
+    assert [f.name for f in dataclasses.fields(addr)] == list(address.Address.__slots__)
+    assert addr.as_dict()["city"] == "CityVille"
+
+
+def test_address_serializers():
+    [addr] = parse("xxx 225 E. John Carpenter Freeway, Irving, Texas 75062", "US")
+    assert addr.as_dict() == dataclasses.asdict(addr)
+    assert addr.as_tuple() == tuple(addr.as_dict().values())
+    assert address.Address(*addr.as_tuple()) == addr
+    from_row = address.Address.from_row(addr.as_tuple())
+    assert from_row == addr and pickle.loads(pickle.dumps(from_row)) == addr
+    assert json.loads(addr.to_json()) == addr.as_dict()
+    assert "\n" not in addr.to_json()
+
+    fp = io.StringIO()
+    address.Address.to_jsonl(iter([addr, addr]), fp)
+    assert fp.getvalue() == (addr.to_json() + "\n") * 2
+
+
 def test_no_country_selected_exception():
     with pytest.raises(TypeError):
         parser.AddressParser()  # type: ignore
@@ -75,6 +169,358 @@ def test_country_detection_missing():
         parser.AddressParser(country="TheMoon")  # type: ignore
 
 
+def test_parsers_share_compiled_rules():
+    first = parser.AddressParser(country="US")
+    second = parser.AddressParser(country="US")
+    assert isinstance(first.rules, re.Pattern)
+    assert first.rules is second.rules
+    assert first.single_street_rules is second.single_street_rules
+
+
+def test_registry_counters():
+    reg = registry.PatternRegistry()
+    ap = parser.AddressParser(country="CA", registry=reg)
+    assert reg.stats().misses == 0
+
+    ap.parse("xxx 33771 George Ferguson Way Abbotsford, BC V2S 2M5 xxx")
+    stats = reg.stats()
+    # the prefilter and the full address rule
+    assert (stats.hits, stats.misses, stats.size) == (0, 2, 2)
+    assert stats.compile_time > 0
+
+    parser.AddressParser(country="CA", registry=reg).parse("")
+    assert reg.stats().hits == 1
+    assert reg.stats().misses == 2
+
+    reg.clear()
+    assert reg.stats() == registry.RegistryStats(0, 0, 0.0, 0)
+
+
+def test_registry_counters_are_exact_across_threads():
+    reg = registry.PatternRegistry()
+    ap = parser.AddressParser(country="GB", registry=reg)
+    barrier = threading.Barrier(8)
+
+    def run(_):
+        barrier.wait()
+        for _ in range(50):
+            ap.parse("no address here")
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(run, range(8)))
+    stats = reg.stats()
+    assert (stats.prefilter_checks, stats.prefilter_skips) == (400, 400)
+    assert stats.hits + stats.misses == 400
+    assert stats.misses == 1
+
+
+def test_registry_folds_counters_of_exited_threads():
+    reg = registry.PatternRegistry()
+    reg.get("GB", "full_address")
+    reg.get("GB", "full_address")  # counted by the main thread, still alive
+    for _ in range(50):
+        thread = threading.Thread(target=reg.get, args=("GB", "full_address"))
+        thread.start()
+        thread.join()
+    # the counters of a thread are folded when the next thread registers
+    assert len(reg._thread_counters) == 2
+    assert reg.stats().hits == 51
+    assert len(reg._thread_counters) == 1
+    reg.clear()
+    assert reg.stats().hits == 0
+
+
+def test_lazy_rules_are_built_once():
+    calls = []
+
+    def make():
+        calls.append(None)
+        return "rule"
+
+    namespace = {"__name__": "rules"}
+    barrier = threading.Barrier(8)
+
+    def run(_):
+        barrier.wait()
+        return utils.build_lazy_rule(namespace, "rule", {"rule": make})
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        assert list(executor.map(run, range(8))) == ["rule"] * 8
+    assert len(calls) == 1
+
+
+def test_rules_scan_adversarial_inputs_in_linear_time():
+    slow = [g for g in backtracking.check(length=1000) if not g.linear]
+    assert slow == []
+
+
+def test_backtracking_check_finds_quadratic_rules(monkeypatch):
+    quadratic = re.compile(r"[A-Za-z0-9 ]*QQQ")
+    monkeypatch.setattr(registry.registry, "get", lambda country, name: quadratic)
+    slow = {g.kind for g in backtracking.check(["US"], length=1000) if not g.linear}
+    assert "words" in slow
+
+
+def test_registry_warmup():
+    reg = registry.PatternRegistry()
+    reg.warmup(["gb"])
+    assert reg.stats().size == len(registry.RULES)
+    assert reg.stats().misses == len(registry.RULES)
+
+    parser.AddressParser(country="GB", registry=reg).parse_single_street("")
+    assert reg.stats().hits == 1
+
+
+def test_api_warmup(monkeypatch):
+    reg = registry.PatternRegistry()
+    monkeypatch.setattr(registry, "registry", reg)
+    warmup([])
+    assert reg.stats().size == 0
+    warmup(["CA"])
+    assert reg.stats().size == len(registry.RULES)
+
+
+def test_rules_are_built_on_first_access():
+    code = (
+        "import sys, pyap\n"
+        "assert not any(m.startswith('pyap.source_') for m in sys.modules)\n"
+        "import pyap.source_GB.data as data\n"
+        "assert 'full_address' not in vars(data)\n"
+        "assert data.full_address is vars(data)['full_address']\n"
+        "assert 'full_street' in vars(data)\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_batch_and_async_modules_are_imported_on_first_use():
+    code = (
+        "import sys, pyap\n"
+        "heavy = ('asyncio', 'concurrent.futures', 'mmap', 'pyap.batch')\n"
+        "assert not [m for m in heavy if m in sys.modules]\n"
+        "assert pyap.parse_many is sys.modules['pyap.batch'].parse_many\n"
+        "from pyap import aparse, parse_file\n"
+        "assert 'asyncio' in sys.modules and 'mmap' in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+    with pytest.raises(AttributeError):
+        pyap.no_such_function  # type: ignore
+
+
+def test_registry_disk_cache(tmp_path):
+    reg = registry.PatternRegistry(cache_dir=str(tmp_path))
+    pattern = reg.get("GB", "full_street")
+    assert [p.name for p in tmp_path.iterdir()] == ["GB-full_street.json"]
+    assert reg.stats().disk_hits == 0
+
+    reloaded = registry.PatternRegistry(cache_dir=str(tmp_path))
+    assert reloaded.get("GB", "full_street").pattern == pattern.pattern
+    assert reloaded.stats().disk_hits == 1
+
+
+def test_registry_disk_cache_skips_stale_entries(tmp_path):
+    entry = {"fingerprint": "stale", "source": "(?P<full_street>x)"}
+    (tmp_path / "GB-full_street.json").write_text(json.dumps(entry))
+    reg = registry.PatternRegistry(cache_dir=str(tmp_path))
+    assert reg.get("GB", "full_street").pattern != entry["source"]
+    assert reg.stats().disk_hits == 0
+    assert "stale" not in (tmp_path / "GB-full_street.json").read_text()
+
+
+def test_disk_cache_avoids_rule_generation(tmp_path):
+    registry.PatternRegistry(cache_dir=str(tmp_path)).warmup(["US"])
+    code = (
+        "import sys, pyap\n"
+        "assert pyap.parse('xxx 225 E. John Carpenter Freeway, Suite 1500 "
+        "Irving, Texas 75062 xxx', 'US')\n"
+        "assert 'pyap.source_US.data' not in sys.modules\n"
+    )
+    env = dict(os.environ, PYAP_CACHE_DIR=str(tmp_path))
+    subprocess.run([sys.executable, "-c", code], check=True, env=env)
+
+
+def test_rules_do_not_depend_on_hash_seed():
+    code = (
+        "import pyap.registry as r\n"
+        "print(r.registry.fingerprint('US'),"
+        " r.registry.fingerprint('US', 'full_street'))"
+    )
+    fingerprints = {
+        subprocess.run(
+            [sys.executable, "-c", code],
+            check=True,
+            capture_output=True,
+            text=True,
+            env=dict(os.environ, PYTHONHASHSEED=seed),
+        ).stdout
+        for seed in ("1", "2", "3")
+    }
+    assert len(fingerprints) == 1
+    assert fingerprints.pop().split() == [
+        registry.registry.fingerprint("US"),
+        registry.registry.fingerprint("US", "full_street"),
+    ]
+
+
+def test_prefilter_skips_texts_without_address():
+    reg = registry.PatternRegistry()
+    ap = parser.AddressParser(country="GB", registry=reg)
+    assert ap.parse("no postal code here, 221B Baker Street, London") == []
+    assert ("GB", "full_address") not in reg._patterns
+    assert ap.parse("221B Baker Street, London NW1 6XE")
+    stats = reg.stats()
+    assert (stats.prefilter_checks, stats.prefilter_skips) == (2, 1)
+
+    no_prefilter = parser.AddressParser(country="GB", registry=reg, prefilter=False)
+    assert no_prefilter.parse("no postal code") == []
+    assert reg.stats().prefilter_checks == 2
+
+
+@pytest.mark.parametrize(
+    "country, text",
+    [
+        ("US", "xxx 225 E. John Carpenter Freeway, Suite 1500 Irving, Texas 75062"),
+        ("US", "One Broadway, New York, NY"),
+        ("CA", "xxx 33771 George Ferguson Way Abbotsford, BC V2S 2M5 xxx"),
+        ("GB", "Flat 8, 22 Baker Street, London NW1 6XE"),
+    ],
+)
+def test_prefilter_keeps_addresses(country, text):
+    with_prefilter = parser.AddressParser(country=country).parse(text)
+    without = parser.AddressParser(country=country, prefilter=False).parse(text)
+    assert with_prefilter
+    assert [a.as_dict() for a in with_prefilter] == [a.as_dict() for a in without]
+
+
+@pytest.mark.parametrize(
+    "country, addresses",
+    [
+        (
+            "US",
+            [
+                "225 E. John Carpenter Freeway, Suite 1500 Irving, Texas 75062",
+                "One Broadway, New York, NY",
+                "1111 3rd Street Promenade, Santa Monica, CA 90000",
+            ],
+        ),
+        (
+            "CA",
+            [
+                "33771 George Ferguson Way Abbotsford, BC V2S 2M5",
+                "1050 Rue Sherbrooke Ouest, Montréal, QC H3A 2R6",
+            ],
+        ),
+        (
+            "GB",
+            ["221B Baker Street, London NW1 6XE", "10 Downing Street, London SW1A 2AA"],
+        ),
+    ],
+)
+def test_anchored_strategy_finds_same_addresses(country, addresses):
+    filler = "\nlorem ipsum dolor sit amet " * 40
+    text = filler.join([""] + addresses * 2 + [""])
+    scan = parser.AddressParser(country=country).parse(text)
+    anchored = parser.AddressParser(country=country, strategy="anchored").parse(text)
+    assert len(scan) == len(addresses) * 2
+    assert [a.as_dict() for a in anchored] == [a.as_dict() for a in scan]
+
+
+@pytest.mark.parametrize("strategy", ["scan", "anchored"])
+def test_parse_budget_covers_whole_search(strategy):
+    reg = registry.PatternRegistry()
+    ap = parser.AddressParser(country="US", registry=reg, strategy=strategy)
+    text = backtracking.adversarial("separators", 200_000, "US")
+    result = ap.parse(text, timeout=0)
+    assert result == [] and result.truncated
+    # the prefilter scans the whole text at once, it is skipped
+    assert reg.stats().prefilter_checks == 0
+
+
+@pytest.mark.parametrize("strategy", ["scan", "anchored"])
+def test_parse_budget(monkeypatch, strategy):
+    monkeypatch.setattr(parser, "SCAN_WINDOW", 16)
+    ap = parser.AddressParser(country="US", strategy=strategy)
+    text = "\n".join(BATCH)
+    expected = ap.parse(text)
+    assert len(expected) > 1 and not expected.truncated
+
+    result = ap.parse(text, max_steps=10**6, timeout=60)
+    assert result == expected and not result.truncated
+
+    partial = ap.parse(text, max_steps=3)
+    assert partial and partial.truncated
+    assert partial == expected[: len(partial)]
+
+    assert ap.parse(text, timeout=0) == []
+    assert ap.parse(text, timeout=0).truncated
+
+
+def test_unknown_strategy():
+    with pytest.raises(ValueError):
+        parser.AddressParser(country="US", strategy="fastest")  # type: ignore
+
+
+def test_registry_country_detection_missing():
+    with pytest.raises(exceptions.CountryDetectionMissing):
+        registry.PatternRegistry().get("XX", "full_address")
+
+
+def test_str_list_to_trie_regex():
+    assert (
+        utils.str_list_to_trie_regex(["Ave", "Avenue", "Avn", "Bay(?!\\ 1)"])
+        == "(?ai:av(?:e(?:nue)?|n)|bay(?!\\ 1))"
+    )
+    assert (
+        utils.str_list_to_trie_regex(["Ave", "Avenue"], factor=False)
+        == "(?ai:avenue|ave)"
+    )
+    assert utils.str_list_to_trie_regex(["Île", "Ile"]) == "(?ai:(?:[îÎ]le|ile))"
+
+
+@pytest.mark.parametrize(
+    "text,expected",
+    [
+        ("STREET", True),
+        ("Île", True),
+        ("ÎLE", True),
+        # case folding is ASCII only, like the '[Ss]'-style classes were
+        ("\u017ftreet", False),  # long s
+        ("Par\u212a", False),  # Kelvin sign
+        ("\u0130le", False),  # dotted capital I
+    ],
+)
+def test_str_list_to_trie_regex_folds_ascii_only(text, expected):
+    trie = re.compile(utils.str_list_to_trie_regex(["Street", "Park", "Île"]))
+    assert (trie.fullmatch(text) is not None) == expected
+
+
+def test_rules_fold_ascii_only():
+    for country in registry.COUNTRIES:
+        assert "(?i:" not in registry.registry.get(country, "full_address").pattern
+    text = "1111 3rd {}treet Promenade, Santa Monica, CA 90000"
+    assert len(parse(text.format("S"), "US")) == 1
+    assert parse(text.format("\u017f"), "US") == []
+
+
+@pytest.mark.parametrize(
+    "text", ["Ave", "AVENUE", "avn", "Avenues", "Bay", "Bay 1", "Cut Off", "Cut", "C"]
+)
+def test_str_list_to_trie_regex_matches_like_flat_alternation(text):
+    words = ["Ave", "Avenue", "Avn", "Bay(?!\\ 1)", "Cut\\ Off", "Cut"]
+    trie = re.compile(utils.str_list_to_trie_regex(words))
+    flat = re.compile(utils.str_list_to_trie_regex(words, factor=False))
+    found, expected = trie.match(text), flat.match(text)
+    assert (found and found.group()) == (expected and expected.group())
+
+
+def test_str_list_to_regex():
+    assert (
+        utils.str_list_to_regex(["Cour", "Court", "Île", "Cour", "Bay(?!\\ 1)"])
+        == "(?ai:cour|court|[îÎ]le|bay(?!\\ 1))"
+    )
+    found = re.match(utils.str_list_to_regex(["Pl", "Plaza"]), "Plaza")
+    assert found and found.group() == "Pl"
+
+
 def test_normalize_string():
     ap = parser.AddressParser(country="US")
     raw_string = (
@@ -84,10 +530,92 @@ def test_normalize_string():
     assert ap._normalize_string(raw_string) == clean_string
 
 
-def test_combine_results():
+def test_record_shifts():
+    raw_string = "a  ,\t, b —  c \t d"
+    shifts = offsets.ShiftTable()
+    parser.AddressParser._record_shifts(raw_string, shifts)
+    clean = parser.AddressParser._normalize_string(raw_string)
+    assert clean == "a, b - c \t d"
+    mapped = [raw_string[shifts.original(i)] for i in range(len(clean))]
+    assert "".join(mapped) == "a,\tb — c \t d"
+    assert shifts.original(len(clean)) == len(raw_string)
+    assert len(shifts) == 4
+
+
+def test_parse_maps_offsets_only_for_matches(monkeypatch):
+    calls = []
+    record_shifts = parser.AddressParser._record_shifts
+
+    def record(text: str, shifts: offsets.ShiftTable) -> None:
+        calls.append(text)
+        record_shifts(text, shifts)
+
+    monkeypatch.setattr(parser.AddressParser, "_record_shifts", staticmethod(record))
+    ap = parser.AddressParser(country="US")
+    assert ap.parse("no  address ,  here") == []
+    assert calls == []
+    [addr] = ap.parse("xx  225 E. John Carpenter Freeway ,  Irving, Texas 75062")
+    assert len(calls) == 1
+    assert addr.match_start == 4
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "xxx   225 E. John Carpenter Freeway ,\t Suite 1500 Irving, Texas 75062 xxx",
+        "a,b \t,, c —   33771 George Ferguson Way Abbotsford,   BC V2S 2M5, , ",
+    ],
+)
+def test_address_offsets_point_into_original_text(text):
+    country = "US" if "Texas" in text else "CA"
+    ap = parser.AddressParser(country=country)
+    [addr] = ap.parse(text)
+    original = text[addr.match_start : addr.match_end]
+    assert ap._normalize_string(original).strip(" ,") == addr.full_address
+    [streamed] = ap.iter_parse(io.StringIO(text), chunk_size=3, overlap=200)
+    assert (streamed.match_start, streamed.match_end) == (
+        addr.match_start,
+        addr.match_end,
+    )
+
+
+def combine_results(match_as_dict):
+    """Reference for how the groups of a match make the address fields:
+    non-empty values of alternatives like 'postal_code_b' are stored as
+    'postal_code', the last one wins
+    """
+    keys = []
+    vals = []
+    for k, v in match_as_dict.items():
+        if k[-2:] in "_a_b_c_d_e_f_g_h_i_j_k_l_m":
+            if v:
+                # strip last 2 chars: '..._b' -> '...'
+                keys.append(k[:-2])
+                vals.append(v)
+        else:
+            if k not in keys:
+                keys.append(k)
+                vals.append(v)
+    return dict(zip(keys, vals))
+
+
+def test_parse_address_follows_combine_results():
+    rules = re.compile(
+        r"(?P<full_street>)(?P<line1>)"
+        r"(?P<city_a>a)?(?P<city>b)?(?P<city_b>c)?(?P<region1_a>d)?(?P<postal_code>e)?"
+    )
     ap = parser.AddressParser(country="US")
-    raw_dict = {"test_one": None, "test_one_a": 1, "test_two": None, "test_two_b": 2}
-    assert ap._combine_results(raw_dict) == {"test_one": 1, "test_two": 2}
+    for text in ["", "a", "b", "ab", "abc", "bc", "ac", "de", "ace"]:
+        match = rules.match(text)
+        assert match
+        combined = combine_results({**match.groupdict(), "country_id": "US"})
+        expected = address.Address(
+            match_start=0,
+            match_end=len(text),
+            full_address=combined["full_street"],
+            **combined,
+        )
+        assert ap._parse_address(match) == expected
 
 
 @pytest.mark.parametrize(
@@ -5,7 +5,7 @@
 import re
 import pytest
 import pyap.source_CA.data as data_ca
-from pyap import utils
+from pyap import parse_single_street, utils
 
 
 @pytest.mark.parametrize(
@@ -212,6 +212,20 @@ def test_street_type(input, expected):
     assert is_found == expected
 
 
+@pytest.mark.parametrize(
+    "input,expected",
+    [
+        # the first street type of the list wins, not the longest one
+        ("101 N Court Sq Ste 16", "101 N Cour"),
+        ("One Baylor Plaza MS: BCM204", "One Baylor Pl"),
+        ("One Baylor estates MS: BCM204", "One Baylor estates"),
+    ],
+)
+def test_street_type_order(input, expected):
+    """tests that street types are tried in the order of the list"""
+    assert [a.full_address for a in parse_single_street(input, "CA")] == [expected]
+
+
 @pytest.mark.parametrize(
     "input,expected",
     [